@@ -6,40 +6,148 @@ cargando datos desde las carpetas 'results-docker' y 'results-vm'.
 """
 
 import os
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+import re
+import json
 import glob
+import hashlib
+import inspect
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# pandas, numpy y el motor estadístico (que también los usa) se importan solo
+# cuando hay archivos de resultados; sin datos no se paga su carga
+pd = np = estadistica = None
+
+# Tamaño de entrada de referencia del runner (sus archivos conservan el nombre original)
+DEFAULT_N = 100
+
+# Aritmética que usa cada programa sin --bigint
+NATIVE_ARITHMETIC = {'python3': 'bigint', 'java': 'int64', 'javascript': 'float64'}
+
+# Ingesta de los resultado_*.txt del formato anterior: la línea de tiempo está
+# en la cabecera, y un índice por directorio evita volver a leer los archivos
+# que no han cambiado desde la última ejecución
+HEADER_BYTES = 4096
+INDEX_FILE = '.indice_resultados.json'
+PARSE_BATCH = 256
+TIME_PATTERN = re.compile(r'Tiempo de ejecuci[óo]n:\s*(\d+\.\d+)\s*segundos', re.IGNORECASE)
+TIME_KEYWORDS = ['tiempo', 'time', 'duration', 'execution', 'seg', 'sec', 'segundos', 'seconds']
+FALLBACK_PATTERNS = [re.compile(pattern) for pattern in (
+    r'(\d+\.?\d*)\s*segundos',
+    r'(\d+\.?\d*)\s*s\b',
+    r'(\d+\.?\d*)\s*sec',
+    r'tiempo:?\s*(\d+\.?\d*)',
+    r'time:?\s*(\d+\.?\d*)',
+)]
+
+# Esquema fijo del almacén estructurado del runner (ejecuciones.csv / ejecuciones.parquet)
+STORE_DTYPES = {
+    'run_id': 'string', 'entorno': 'string', 'host': 'string', 'kernel': 'string', 'cpus': 'Int64',
+    'idioma': 'string', 'aritmetica': 'string', 'modo': 'string', 'tipo': 'string', 'n': 'Int64',
+    'fase': 'string', 'repeticion': 'Int64', 'tiempo': 'float64', 'cpu_usuario': 'float64',
+    'cpu_sistema': 'float64', 'rss_max_kb': 'float64', 'rss_arnes_kb': 'float64',
+    'cambios_voluntarios': 'Int64', 'cambios_involuntarios': 'Int64', 'fallos_menores': 'Int64',
+    'fallos_mayores': 'Int64', 'digest': 'string', 'correcto': 'string', 'error': 'string',
+}
+
+# Gráficas: se dibujan en un pool de procesos con el backend Agg y se omiten
+# cuando el hash de su código y de sus datos de entrada no ha cambiado desde
+# la última vez. matplotlib y seaborn solo se importan en quien dibuja.
+CHART_DPI = 300
+CHART_CACHE_FILE = '.graficas.json'
+_plotting_modules = None
+
+# Métricas de recursos por ejecución que guarda el runner junto al tiempo de reloj
+RESOURCE_COLUMNS = {
+    'cpu_usuario': 'CPU usuario (s)',
+    'cpu_sistema': 'CPU sistema (s)',
+    'rss_max_kb': 'RSS máximo (KB)',
+    'cambios_voluntarios': 'Cambios de contexto voluntarios',
+    'cambios_involuntarios': 'Cambios de contexto involuntarios',
+    'fallos_menores': 'Fallos de página menores',
+    'fallos_mayores': 'Fallos de página mayores',
+}
+
+# Archivos que escribe el runner o el planificador en cada directorio de resultados
+RESULT_SUFFIXES = ('.txt', '.csv', '.parquet')
+
+
+def data_modules():
+    """Importa pandas, numpy y estadistica la primera vez que hay datos que cargar"""
+    global pd, np, estadistica
+    if pd is None:
+        import numpy
+        import pandas
+        import estadistica as motor
+        pd, np, estadistica = pandas, numpy, motor
+
+
+def has_results(directories):
+    """Indica si algún directorio contiene archivos de resultados, sin abrirlos"""
+    return any(entry.is_file() and entry.name.endswith(RESULT_SUFFIXES)
+               for directory in directories if os.path.isdir(directory)
+               for entry in os.scandir(directory))
+
+
+def print_no_data():
+    print("\nNo hay datos para analizar. Por favor, asegúrese de que existan archivos TXT válidos en las carpetas 'results-docker' y 'results-vm'.")
+    print("\nPuede intentar agregar manualmente algunos archivos de resultados para realizar el análisis.")
+    print("Ejemplo de formato de archivo de resultados:")
+    print("---")
+    print("Tiempo de ejecución: 2.5 segundos")
+    print("---")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compara los tiempos de ejecución entre Docker y VM")
+    parser.add_argument("--sin-graficas", action="store_true",
+                        help="solo análisis estadístico; no importa matplotlib ni dibuja nada")
+    parser.add_argument("--procesos", type=int, default=None,
+                        help="procesos para dibujar las gráficas (por defecto, uno por CPU)")
+    parser.add_argument("--forzar", action="store_true",
+                        help="vuelve a dibujar todas las gráficas aunque sus datos no hayan cambiado")
+    return parser.parse_args()
+
 
 def main():
     """Función principal que ejecuta todo el análisis"""
+    args = parse_args()
     print("Iniciando análisis comparativo de tiempos de ejecución entre Docker y VM...")
     
     # Asegurar que existan los directorios necesarios
     check_directories()
     
-    # Configurar estilo de las gráficas
-    plt.style.use('ggplot')
-    sns.set_style("whitegrid")
-    plt.rcParams['figure.figsize'] = (12, 7)
-    plt.rcParams['font.size'] = 12
+    # Sin archivos de resultados no hace falta importar pandas ni numpy
+    if not has_results(["./results-docker/", "./results-vm/"]):
+        print_no_data()
+        return
     
     # Definir rutas a los archivos de resultados
-    docker_results_path = "./results-docker/"
-    vm_results_path = "./results-vm/"
+    charts = analyze("./results-docker/", "./results-vm/", with_charts=not args.sin_graficas)
+    
+    if charts and not args.sin_graficas:
+        render_charts(charts, args.procesos, args.forzar)
+        print("\nAnálisis completado. Las gráficas se han guardado en el directorio principal.")
+    else:
+        print("\nAnálisis completado.")
+
+
+def analyze(docker_results_path, vm_results_path, with_charts=True):
+    """Carga los datos, imprime el análisis y devuelve las gráficas que se pueden dibujar"""
+    data_modules()
+    charts = []
     
     # Cargar datos
     print("\n" + "="*70)
     print("CARGANDO DATOS DE DOCKER")
     print("="*70)
-    docker_data = load_execution_times(docker_results_path)
+    docker_data = load_results(docker_results_path)
     print(f"Se cargaron {len(docker_data)} registros de Docker")
     
     print("\n" + "="*70)
     print("CARGANDO DATOS DE VM")
     print("="*70)
-    vm_data = load_execution_times(vm_results_path)
+    vm_data = load_results(vm_results_path)
     print(f"Se cargaron {len(vm_data)} registros de VM")
     print("="*70 + "\n")
     
@@ -59,13 +167,8 @@ def main():
     
     # Verificar si tenemos datos para procesar
     if all_data.empty:
-        print("\nNo hay datos para analizar. Por favor, asegúrese de que existan archivos TXT válidos en las carpetas 'results-docker' y 'results-vm'.")
-        print("\nPuede intentar agregar manualmente algunos archivos de resultados para realizar el análisis.")
-        print("Ejemplo de formato de archivo de resultados:")
-        print("---")
-        print("Tiempo de ejecución: 2.5 segundos")
-        print("---")
-        return
+        print_no_data()
+        return charts
     
     # Eliminar filas con valores NaN si existen
     if 'execution_time' in all_data.columns and all_data['execution_time'].isna().any():
@@ -73,6 +176,24 @@ def main():
         print(f"\nEliminando {na_count} filas con valores de tiempo no válidos.")
         all_data = all_data.dropna(subset=['execution_time'])
     
+    # Curvas de escalado tiempo-vs-n si hay barridos de tamaño de entrada
+    scaling_data = pd.concat([all_data, load_matrix_results({'Docker': docker_results_path, 'VM': vm_results_path})],
+                             ignore_index=True)
+    charts += analyze_scaling(scaling_data)
+    
+    # Las pruebas por lenguaje y n agrupan ellas mismas por tamaño: ven el barrido completo
+    compare_groups(all_data)
+    
+    # El resto del análisis compara entornos con el tamaño de referencia
+    if 'n' in all_data.columns:
+        all_data = all_data[all_data['n'].isna() | (all_data['n'] == DEFAULT_N)]
+    # Los cálculos en caliente del modo worker (µs) no se mezclan con los procesos completos (ms);
+    # sus series ya se comparan aparte en compare_groups
+    worker = all_data['file'].str.endswith('_worker.txt').fillna(False)
+    if worker.any():
+        print(f"\nLas vistas por entorno usan solo el modo proceso: {worker.sum()} muestras del modo worker excluidas.")
+        all_data = all_data[~worker]
+    
     # Mostrar datos cargados
     if not all_data.empty:
         print("\nDatos cargados:")
@@ -81,25 +202,29 @@ def main():
     # Verificar nuevamente si tenemos datos suficientes después de eliminar NaN
     if all_data.empty or len(all_data) < 2:
         print("\nNo hay suficientes datos para realizar un análisis comparativo. Se necesitan al menos dos registros (uno de Docker y uno de VM).")
-        return
+        return charts
     
     # Verificar si tenemos datos de ambos entornos
     if 'Docker' not in all_data['environment'].values:
         print("\nNo hay datos válidos para Docker. No se puede realizar comparación.")
-        return
+        return charts
     if 'VM' not in all_data['environment'].values:
         print("\nNo hay datos válidos para VM. No se puede realizar comparación.")
-        return
+        return charts
     
     # Realizar análisis estadístico
     perform_statistical_analysis(all_data)
     
-    # Crear visualizaciones
-    create_visualizations(all_data)
+    # Comparar CPU, memoria y cambios de contexto si el runner los registró
+    charts += compare_resource_usage(all_data)
     
-    # Generar conclusiones
+    # Crear visualizaciones
+    charts += create_visualizations(all_data)
     
-    print("\nAnálisis completado. Las gráficas se han guardado en el directorio principal.")
+    # Líneas temporales de CPU y memoria si el runner usó --muestreo-ms (solo sirven para dibujar)
+    if with_charts:
+        charts += plot_timelines({'Docker': docker_results_path, 'VM': vm_results_path})
+    return charts
 
 
 def check_directories():
@@ -121,139 +246,244 @@ def check_directories():
     return True
 
 
+def _fallback_times(content):
+    """Heurísticas de respaldo para archivos sin la línea de tiempo del runner"""
+    time_values = []
+    # Método 1: números en líneas que contengan palabras clave de tiempo
+    for line in content.split('\n'):
+        if any(keyword in line.lower() for keyword in TIME_KEYWORDS):
+            numbers = []
+            for word in line.split():
+                clean_word = word.strip().strip(',:;()[]{}"\'')
+                if clean_word.replace('.', '', 1).isdigit():
+                    numbers.append(float(clean_word))
+            if numbers:
+                time_values.append(numbers[0])
+    # Método 2: números solitarios en las últimas líneas
+    if not time_values:
+        for line in content.strip().split('\n')[-5:]:
+            line = line.strip()
+            if line and all(c.isdigit() or c in '.,+-' for c in line):
+                try:
+                    time_values.append(float(line.replace(',', '.')))
+                except ValueError:
+                    pass
+    # Método 3: patrones como "10 segundos", "10 s" o "time: 10"
+    if not time_values:
+        lowered = content.lower()
+        for pattern in FALLBACK_PATTERNS:
+            for match in pattern.findall(lowered):
+                try:
+                    time_values.append(float(match))
+                except ValueError:
+                    continue
+    return time_values
+
+
+def parse_result_file(file_path):
+    """Tiempo de ejecución de un archivo de resultados, o NaN si no se encuentra"""
+    # La línea de tiempo está al principio: basta con la cabecera, no con la salida completa
+    with open(file_path, 'rb') as file:
+        header = file.read(HEADER_BYTES).decode('utf-8', errors='ignore')
+    for line in header.split('\n')[:10]:
+        match = TIME_PATTERN.search(line)
+        if match:
+            return float(match.group(1))
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
+        time_values = _fallback_times(file.read())
+    if not time_values:
+        return np.nan
+    return time_values[0] if len(time_values) == 1 else float(np.median(time_values))
+
+
+def _read_index(index_path):
+    try:
+        with open(index_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_index(index_path, index):
+    # Escritura atómica para que una ejecución interrumpida no deje un índice a medias
+    temporary = index_path + '.tmp'
+    with open(temporary, 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+    os.replace(temporary, index_path)
+
+
 def load_execution_times(directory):
-    """Carga los tiempos de ejecución desde archivos TXT en el directorio especificado"""
-    all_files = glob.glob(os.path.join(directory, "*.txt"))
-    
-    if not all_files:
+    """Carga los tiempos de ejecución desde archivos TXT en el directorio especificado
+
+    Solo se analizan los archivos nuevos o modificados (según su tamaño y
+    mtime), en paralelo; el resto sale del índice guardado en el directorio.
+    """
+    entries = [entry for entry in os.scandir(directory) if entry.is_file() and entry.name.endswith('.txt')]
+    if not entries:
         print(f"No se encontraron archivos TXT en {directory}")
         return pd.DataFrame(columns=['file', 'execution_time'])  # Devolver DataFrame vacío pero con columnas
+
+    index_path = os.path.join(directory, INDEX_FILE)
+    index = _read_index(index_path)
+    current = {}
+    pending = []
+    for entry in entries:
+        stat = entry.stat()
+        cached = index.get(entry.name)
+        if cached and cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+            current[entry.name] = cached
+        else:
+            pending.append((entry, stat))
+
+    def parse_batch(batch):
+        records = {}
+        for entry, stat in batch:
+            try:
+                value = parse_result_file(entry.path)
+            except OSError as e:
+                print(f"Error al procesar {entry.path}: {e}")
+                continue
+            records[entry.name] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+                                   'execution_time': None if np.isnan(value) else value}
+        return records
+
+    # Lotes de archivos por tarea: un future por archivo cuesta más que leer su cabecera
+    batches = [pending[i:i + PARSE_BATCH] for i in range(0, len(pending), PARSE_BATCH)]
+    with ThreadPoolExecutor() as executor:
+        for records in executor.map(parse_batch, batches):
+            current.update(records)
+    # Las entradas de archivos borrados desaparecen del índice
+    if pending or len(current) != len(index):
+        _write_index(index_path, current)
+
+    result_df = pd.DataFrame({
+        'file': list(current),
+        'execution_time': [np.nan if r['execution_time'] is None else r['execution_time'] for r in current.values()],
+    })
+    print(f"{len(result_df)} archivos TXT en {directory}: {len(pending)} analizados, "
+          f"{len(result_df) - len(pending)} desde el índice")
+    missing = result_df['execution_time'].isna().sum()
+    if missing:
+        print(f"Nota: {missing} archivos no tenían valores de tiempo detectables.")
+    return result_df
+
+
+def series_labels(df, n):
+    """Nombre de archivo y etiqueta de cada serie, con la misma convención que el runner"""
+    # resultado_<idioma>[_<tipo>][_<aritmética>][_n<n>][_worker].txt
+    language = df['idioma'].astype(str)
+    tipo = df['tipo'].fillna('serie').astype(str) if 'tipo' in df.columns else pd.Series('serie', index=df.index)
+    tipo = tipo.replace('', 'serie')
+    language = language.where(tipo == 'serie', language + ' [' + tipo + ']')
+    suffix = pd.Series('', index=df.index).where(tipo == 'serie', '_' + tipo)
+    # Solo se distingue la aritmética cuando no es la nativa del lenguaje (p. ej. java con --bigint)
+    arithmetic = df['aritmetica'].fillna('').astype(str) if 'aritmetica' in df.columns else pd.Series('', index=df.index)
+    non_native = (arithmetic != '') & (arithmetic != df['idioma'].astype(str).map(NATIVE_ARITHMETIC))
+    language = language.where(~non_native, language + ' [' + arithmetic + ']')
+    suffix = suffix.where(~non_native, suffix + '_' + arithmetic)
+    suffix = suffix.where(n.isna() | (n == DEFAULT_N), suffix + '_n' + n.fillna(0).astype('int64').astype(str))
+    # Las mediciones en caliente del modo worker se tratan como una serie aparte
+    worker = (df['modo'] == 'worker').fillna(False) if 'modo' in df.columns else pd.Series(False, index=df.index)
+    suffix = suffix.where(~worker, suffix + '_worker')
+    language = language.where(~worker, language + ' (worker)')
+    return 'resultado_' + df['idioma'].astype(str) + suffix + '.txt', language
+
+
+def load_store(directory):
+    """Carga el almacén estructurado del runner en una sola lectura tipada"""
+    csv_path = os.path.join(directory, 'ejecuciones.csv')
+    parquet_path = os.path.join(directory, 'ejecuciones.parquet')
+    columns = ['file', 'language', 'n', 'execution_time', 'repeticion', 'run_id', 'timestamp']
+    # La copia Parquet solo se usa si está al día con el CSV, que es el que crece
+    if os.path.exists(parquet_path) and (not os.path.exists(csv_path)
+                                         or os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)):
+        store = pd.read_parquet(parquet_path)
+    elif os.path.exists(csv_path):
+        store = pd.read_csv(csv_path, dtype=STORE_DTYPES, parse_dates=['marca_tiempo'])
+    else:
+        return pd.DataFrame(columns=columns)
+    store = store[store['fase'] == 'medicion']
+    n = store['n'].astype('float64')
+    file, language = series_labels(store, n)
+    # Una salida que no coincide con el digest de referencia no es una medición válida
+    wrong = (store['correcto'] == 'no').fillna(False)
+    if wrong.any():
+        print(f"  ejecuciones: {wrong.sum()} muestras con salida incorrecta descartadas")
+    # Tampoco lo es el tiempo de una ejecución que falló o se mató por timeout
+    failed = store['error'].fillna('').ne('')
+    if failed.any():
+        print(f"  ejecuciones: {failed.sum()} muestras fallidas o con tiempo agotado descartadas")
+    wrong = wrong | failed
+    data = pd.DataFrame({
+        'file': file,
+        'language': language,
+        'n': n,
+        'execution_time': store['tiempo'].mask(wrong),
+        'repeticion': store['repeticion'],
+        'run_id': store['run_id'],
+        'timestamp': store['marca_tiempo'],
+    })
+    for col in RESOURCE_COLUMNS:
+        if col in store.columns:
+            # Los contadores son Int64; en float64 sus huecos son NaN como en el resto
+            data[col] = store[col].astype('float64').mask(failed)
+    print(f"Se cargaron {len(data)} ejecuciones del almacén de {directory}")
+    return data.reset_index(drop=True)
+
+
+def load_results(directory):
+    """Almacén estructurado más los archivos del formato anterior que no cubra"""
+    store = load_store(directory)
+    legacy = merge_sample_times(load_execution_times(directory), load_sample_times(directory))
+    if store.empty:
+        return legacy
+    if legacy.empty:
+        return store
+    return pd.concat([legacy[~legacy['file'].isin(store['file'])], store], ignore_index=True)
+
+
+def load_sample_times(directory):
+    """Carga las muestras crudas (muestras_*.csv) que guarda el runner con repeticiones"""
+    all_files = glob.glob(os.path.join(directory, "muestras_*.csv"))
     
-    data = []
-    
+    dfs = []
     for file_path in all_files:
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-                content = file.read()
-                print(f"Procesando archivo: {os.path.basename(file_path)}")
-                
-                # Imprimir primeras líneas para depuración
-                print(f"Primeras 3 líneas del archivo:")
-                content_lines = content.split('\n')
-                for i, line in enumerate(content_lines[:3]):
-                    print(f"  Línea {i+1}: {line}")
-                
-                # Buscar tiempos de ejecución
-                time_values = []
-                
-                # Método principal: Buscar específicamente el patrón "Tiempo de ejecución: X segundos"
-                # Este patrón parece ser el más común en tus archivos
-                import re
-                tiempo_pattern = re.compile(r'Tiempo de ejecuci[óo]n:\s*(\d+\.\d+)\s*segundos', re.IGNORECASE)
-                
-                # Primero, revisar las primeras líneas para el patrón de tiempo
-                for line in content_lines[:10]:  # Revisar primeras 10 líneas
-                    match = tiempo_pattern.search(line)
-                    if match:
-                        try:
-                            value = float(match.group(1))
-                            print(f"  Encontrado tiempo de ejecución: {value} segundos")
-                            time_values.append(value)
-                            break  # Encontramos el tiempo principal, no necesitamos buscar más
-                        except ValueError:
-                            pass
-                
-                # Si no encontramos el patrón específico, intentar con una búsqueda más generalizada
-                if not time_values:
-                    # Método 1: Buscar valores numéricos en líneas que contengan palabras clave
-                    for line in content_lines:
-                        # Palabras clave que podrían indicar un tiempo de ejecución
-                        if any(keyword in line.lower() for keyword in ['tiempo', 'time', 'duration', 'execution', 'seg', 'sec', 'segundos', 'seconds']):
-                            try:
-                                # Intentar extraer números de la línea
-                                numbers = []
-                                for word in line.split():
-                                    word = word.strip()
-                                    # Limpiar la palabra de caracteres no numéricos al principio/final
-                                    clean_word = word.strip(',:;()[]{}"\'' + "'")
-                                    # Verificar si es un número con posible punto decimal
-                                    if clean_word.replace('.', '', 1).isdigit():
-                                        numbers.append(float(clean_word))
-                                
-                                if numbers:
-                                    print(f"  Encontrado posible tiempo: {numbers[0]} en la línea: {line}")
-                                    time_values.append(numbers[0])
-                            except Exception as e:
-                                print(f"  Error al extraer número de la línea: {line}, Error: {e}")
-                    
-                    # Método 2: Si no se encontraron valores, intentar buscar números al final del archivo
-                    if not time_values:
-                        print("  No se encontraron valores usando palabras clave, buscando números solitarios...")
-                        lines = content.strip().split('\n')
-                        # Revisar las últimas líneas del archivo
-                        for line in lines[-5:]:  # Revisar últimas 5 líneas
-                            line = line.strip()
-                            if line and all(c.isdigit() or c in '.,+-' for c in line):
-                                try:
-                                    value = float(line.replace(',', '.'))
-                                    print(f"  Encontrado valor numérico: {value}")
-                                    time_values.append(value)
-                                except ValueError:
-                                    pass
-                    
-                    # Método 3: Buscar patrones específicos como "X segundos" o "X s"
-                    if not time_values:
-                        print("  Buscando patrones específicos de tiempo...")
-                        # Patrones como "10 segundos", "10s", "10 s", etc.
-                        patterns = [
-                            r'(\d+\.?\d*)\s*segundos',
-                            r'(\d+\.?\d*)\s*s\b',
-                            r'(\d+\.?\d*)\s*sec',
-                            r'tiempo:?\s*(\d+\.?\d*)',
-                            r'time:?\s*(\d+\.?\d*)'
-                        ]
-                        
-                        for pattern in patterns:
-                            matches = re.findall(pattern, content.lower())
-                            if matches:
-                                for match in matches:
-                                    try:
-                                        value = float(match)
-                                        print(f"  Encontrado con patrón: {value}")
-                                        time_values.append(value)
-                                    except ValueError:
-                                        continue
-                
-                # Si encontramos valores de tiempo
-                if time_values:
-                    # Usar la mediana para evitar outliers extremos si hay múltiples valores
-                    # o el primer valor si solo hay uno
-                    exec_time = time_values[0] if len(time_values) == 1 else np.median(time_values)
-                    print(f"  Tiempo calculado para {os.path.basename(file_path)}: {exec_time}")
-                    data.append({
-                        'file': os.path.basename(file_path),
-                        'execution_time': exec_time
-                    })
-                else:
-                    print(f"  ADVERTENCIA: No se encontraron valores de tiempo en {file_path}")
-                    # Agregar un marcador para que el archivo aparezca en el análisis
-                    # con un valor de tiempo ficticio (NaN)
-                    data.append({
-                        'file': os.path.basename(file_path),
-                        'execution_time': np.nan
-                    })
-                
-                print("-" * 50)
+            df = pd.read_csv(file_path)
+            # Solo las repeticiones medidas; el calentamiento no forma parte de la distribución
+            df = df[df['fase'] == 'medicion']
+            n = pd.to_numeric(df['n'], errors='coerce') if 'n' in df.columns else pd.Series(np.nan, index=df.index)
+            file, language = series_labels(df, n)
+            execution_time = pd.to_numeric(df['tiempo'], errors='coerce')
+            # Una salida que no coincide con el digest de referencia no es una medición válida
+            if 'correcto' in df.columns:
+                wrong = df['correcto'].astype(str) == 'no'
+                if wrong.any():
+                    print(f"  {os.path.basename(file_path)}: {wrong.sum()} muestras con salida incorrecta descartadas")
+                execution_time = execution_time.mask(wrong)
+            df = df.assign(file=file, language=language, n=n, execution_time=execution_time)
+            resource_cols = [col for col in RESOURCE_COLUMNS if col in df.columns]
+            for col in resource_cols:
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+            dfs.append(df[['file', 'language', 'n', 'execution_time', 'repeticion'] + resource_cols])
         except Exception as e:
-            print(f"Error al procesar {file_path}: {e}")
-    
-    result_df = pd.DataFrame(data)
-    
-    # Si hay valores NaN, informarlo
-    if 'execution_time' in result_df.columns and result_df['execution_time'].isna().any():
-        print("Nota: Algunos archivos no tenían valores de tiempo detectables.")
+            print(f"Error al leer {file_path}: {e}")
     
-    return result_df
+    if dfs:
+        samples = pd.concat(dfs, ignore_index=True)
+        print(f"Se cargaron {len(samples)} muestras crudas desde {directory}")
+        return samples
+    return pd.DataFrame(columns=['file', 'language', 'n', 'execution_time', 'repeticion'])
+
+
+def merge_sample_times(summary_data, sample_data):
+    """Sustituye el tiempo único de cada archivo por todas sus muestras cuando existen"""
+    if sample_data.empty:
+        return summary_data
+    if summary_data.empty:
+        return sample_data
+    keep = summary_data[~summary_data['file'].isin(sample_data['file'])]
+    return pd.concat([keep, sample_data], ignore_index=True)
 
 
 def load_csv_data(directory):
@@ -278,128 +508,249 @@ def load_csv_data(directory):
     return pd.DataFrame()
 
 
+def load_matrix_results(directories):
+    """Carga los resultados del planificador de matrices (matriz.csv) de cada entorno"""
+    dfs = []
+    for env, directory in directories.items():
+        file_path = os.path.join(directory, 'matriz.csv')
+        if not os.path.exists(file_path):
+            continue
+        df = pd.read_csv(file_path)
+        df = df[df['error'].isna()]
+        # Un tiempo con salida incorrecta (desbordamiento de int64 o float64) no entra en el ajuste
+        wrong = df['correcto'].eq('no')
+        if wrong.any():
+            print(f"  matriz de {env}: {wrong.sum()} trabajos con salida incorrecta descartados")
+        df = df[~wrong]
+        n = pd.to_numeric(df['n'], errors='coerce')
+        # Cada tipo de petición y aritmética es una serie propia, como en el almacén del runner
+        _, language = series_labels(df, n)
+        dfs.append(pd.DataFrame({
+            'file': 'matriz.csv',
+            'language': language,
+            'n': n,
+            'execution_time': pd.to_numeric(df['tiempo'], errors='coerce'),
+            'environment': env,
+        }))
+    if dfs:
+        return pd.concat(dfs, ignore_index=True)
+    return pd.DataFrame(columns=['file', 'language', 'n', 'execution_time', 'environment'])
+
+
+def fit_power_law(n_values, times):
+    """Ajusta t = c * n^k por mínimos cuadrados en escala log-log; devuelve (k, c)"""
+    slope, intercept = np.polyfit(np.log10(n_values), np.log10(times), 1)
+    return slope, 10 ** intercept
+
+
+def scaling_groups(medians):
+    """Grupos (entorno, lenguaje) con al menos dos tamaños de entrada, ordenados por n"""
+    return [(key, group.sort_values('n')) for key, group in medians.groupby(['environment', 'language'])
+            if group['n'].nunique() >= 2]
+
+
+def analyze_scaling(all_data):
+    """Ajusta curvas tiempo-vs-n en log-log por lenguaje y entorno; devuelve su gráfica"""
+    if 'n' not in all_data.columns or 'language' not in all_data.columns:
+        return []
+    data = all_data.assign(n=pd.to_numeric(all_data['n'], errors='coerce'),
+                           execution_time=pd.to_numeric(all_data['execution_time'], errors='coerce'))
+    data = data.dropna(subset=['n', 'language', 'execution_time'])
+    data = data[data['execution_time'] > 0]
+    medians = data.groupby(['environment', 'language', 'n'])['execution_time'].median().reset_index()
+    groups = scaling_groups(medians)
+    if not groups:
+        return []
+    
+    print("\nAjuste de escalado t = c·n^k (mediana por tamaño):")
+    for (env, language), group in groups:
+        k, c = fit_power_law(group['n'], group['execution_time'])
+        print(f"  {env:>6} {language:<22} k = {k:.3f}  c = {c:.3e}  "
+              f"(n de {int(group['n'].min())} a {int(group['n'].max())})")
+    return [('comparison_scaling.png', chart_scaling, medians)]
+
+
+def chart_scaling(medians):
+    plt, _ = plotting()
+    plt.figure(figsize=(12, 7))
+    linestyles = {'Docker': '-', 'VM': '--'}
+    for (env, language), group in scaling_groups(medians):
+        k, c = fit_power_law(group['n'], group['execution_time'])
+        line = plt.plot(group['n'], group['execution_time'], 'o', label=f'{language} ({env})')[0]
+        fitted_n = np.logspace(np.log10(group['n'].min()), np.log10(group['n'].max()), 50)
+        plt.plot(fitted_n, c * fitted_n ** k, linestyles.get(env, ':'), color=line.get_color(), alpha=0.7,
+                 label=f'ajuste k={k:.2f}')
+    plt.xscale('log')
+    plt.yscale('log')
+    plt.title('Escalado del tiempo de ejecución con n (log-log)', fontsize=16)
+    plt.xlabel('n (términos de Fibonacci)', fontsize=14)
+    plt.ylabel('Tiempo de Ejecución (segundos)', fontsize=14)
+    plt.grid(which='both', linestyle='--', alpha=0.5)
+    plt.legend(fontsize=9, ncol=2)
+
+
 def perform_statistical_analysis(all_data):
-    """Realiza análisis estadístico básico de los datos"""
-    # Estadísticas descriptivas por entorno
+    """Estadísticas descriptivas por entorno con el tamaño de referencia"""
     stats = all_data.groupby('environment')['execution_time'].describe()
     print("\nEstadísticas de tiempo de ejecución por entorno:")
     print(stats)
-    
-    # Calcular la diferencia porcentual entre Docker y VM
-    if 'Docker' in all_data['environment'].values and 'VM' in all_data['environment'].values:
-        docker_mean = all_data[all_data['environment'] == 'Docker']['execution_time'].mean()
-        vm_mean = all_data[all_data['environment'] == 'VM']['execution_time'].mean()
-        
-        if vm_mean > 0:  # Evitar división por cero
-            percent_diff = ((docker_mean - vm_mean) / vm_mean) * 100
-            faster = "Docker" if docker_mean < vm_mean else "VM"
-            print(f"\nDiferencia porcentual: {abs(percent_diff):.2f}% ({faster} es más rápido)")
-            
-            # Mostrar tiempo promedio
-            print(f"\nTiempo promedio en Docker: {docker_mean:.4f} segundos")
-            print(f"Tiempo promedio en VM: {vm_mean:.4f} segundos")
+
+
+def compare_groups(all_data):
+    """Compara los entornos por lenguaje y n con medianas, intervalos bootstrap y pruebas de significancia"""
+    # Los resultado_*.txt del formato anterior no traen lenguaje ni n: se
+    # deducen del nombre del archivo y del tamaño de referencia
+    data = all_data.assign(
+        language=all_data.get('language', pd.Series(index=all_data.index, dtype=object)).fillna(
+            all_data['file'].str.replace(r'^resultado_|\.txt$', '', regex=True)),
+        n=all_data.get('n', pd.Series(index=all_data.index, dtype=float)).fillna(DEFAULT_N))
+    
+    summary = estadistica.summarize_groups(data)
+    print("\nMediana por entorno, lenguaje y n (IC 95% bootstrap):")
+    print(summary.to_string(index=False))
+    
+    comparisons = estadistica.compare_environments(data)
+    if comparisons.empty:
+        print("\nNingún lenguaje tiene datos en más de un entorno; no hay comparaciones que hacer.")
+        return
+    print("\nComparación entre entornos (Mann-Whitney / permutación, p ajustado por Holm):")
+    for row in comparisons.itertuples(index=False):
+        print(f"  {row.language} (n={row.n:g}): {row.verdict}")
+
+
+def compare_resource_usage(all_data):
+    """Compara las métricas de recursos (rusage) entre entornos para cada lenguaje; devuelve su gráfica"""
+    available = [col for col in RESOURCE_COLUMNS if col in all_data.columns and all_data[col].notna().any()]
+    if not available:
+        print("\nNo hay métricas de recursos en los datos; omitiendo la comparación de recursos.")
+        return []
+    
+    resource_data = all_data.dropna(subset=available, how='all')
+    medians = resource_data.groupby(['file', 'environment'])[available].median()
+    print("\nMediana de métricas de recursos por archivo y entorno:")
+    print(medians)
+    
+    # Relación Docker/VM por métrica (solo archivos presentes en ambos entornos)
+    by_env = medians.unstack('environment')
+    ratios = {}
+    for col in available:
+        if ('Docker' in by_env[col].columns) and ('VM' in by_env[col].columns):
+            ratios[col] = by_env[col]['Docker'] / by_env[col]['VM'].replace(0, np.nan)
+    if ratios:
+        print("\nRelación Docker/VM de cada métrica (>1 significa más alto en Docker):")
+        print(pd.DataFrame(ratios).round(3))
+    
+    print("- Creando comparación de recursos...")
+    return [('comparison_resources.png', chart_resources, resource_data[['file', 'environment'] + available])]
+
+
+def chart_resources(resource_data):
+    plt, sns = plotting()
+    available = [col for col in RESOURCE_COLUMNS if col in resource_data.columns]
+    ncols = 2
+    nrows = (len(available) + ncols - 1) // ncols
+    fig, axes = plt.subplots(nrows, ncols, figsize=(14, 4 * nrows), squeeze=False)
+    for ax, col in zip(axes.flat, available):
+        sns.barplot(x='file', y=col, hue='environment', data=resource_data, estimator=np.median, ax=ax,
+                    palette=['#3498db', '#e74c3c'])
+        ax.set_title(RESOURCE_COLUMNS[col], fontsize=13)
+        ax.set_xlabel('')
+        ax.set_ylabel('')
+        ax.tick_params(axis='x', rotation=30)
+    for ax in list(axes.flat)[len(available):]:
+        ax.set_visible(False)
+
+
+def load_timelines(directory):
+    """Carga las líneas temporales de /proc (timelines/<idioma>_<fase>_<rep>.csv) de un entorno"""
+    dfs = []
+    for file_path in glob.glob(os.path.join(directory, "timelines", "*_medicion_*.csv")):
+        try:
+            df = pd.read_csv(file_path)
+        except Exception as e:
+            print(f"Error al leer {file_path}: {e}")
+            continue
+        if df.empty:
+            continue
+        language, _, repetition = os.path.splitext(os.path.basename(file_path))[0].rsplit('_', 2)
+        # CPU% a partir del incremento de tiempo de CPU en una ventana de ~20 ms:
+        # el contador avanza en ticks de reloj, así que entre muestras vecinas sale a saltos
+        window = max(1, int(np.ceil(20 / max(df['t_ms'].diff().median(), 1e-3))))
+        elapsed = df['t_ms'].diff(window) / 1000
+        df['cpu_pct'] = (df['cpu_s'].diff(window) / elapsed * 100).fillna(0).clip(lower=0)
+        df['language'] = language
+        df['repeticion'] = int(repetition)
+        dfs.append(df)
+    if dfs:
+        return pd.concat(dfs, ignore_index=True)
+    return pd.DataFrame()
+
+
+def plot_timelines(directories):
+    """Líneas temporales de CPU% y RSS por lenguaje y entorno; devuelve su gráfica"""
+    timelines = []
+    for env, directory in directories.items():
+        df = load_timelines(directory)
+        if not df.empty:
+            timelines.append(df.assign(environment=env))
+    if not timelines:
+        return []
+    
+    print("- Creando líneas temporales de CPU y memoria...")
+    timelines = pd.concat(timelines, ignore_index=True)
+    columns = ['language', 'environment', 'repeticion', 't_ms', 'cpu_pct', 'rss_kb']
+    return [('comparison_timelines.png', chart_timelines, timelines[columns])]
+
+
+def chart_timelines(timelines):
+    plt, _ = plotting()
+    languages = sorted(timelines['language'].unique())
+    colors = {'Docker': '#3498db', 'VM': '#e74c3c'}
+    fig, axes = plt.subplots(len(languages), 2, figsize=(14, 4 * len(languages)), squeeze=False)
+    for row, language in zip(axes, languages):
+        for env, env_data in timelines[timelines['language'] == language].groupby('environment'):
+            for i, (_, run) in enumerate(env_data.groupby('repeticion')):
+                label = env if i == 0 else None
+                color = colors.get(env)
+                row[0].plot(run['t_ms'], run['cpu_pct'], color=color, alpha=0.5, label=label)
+                row[1].plot(run['t_ms'], run['rss_kb'] / 1024, color=color, alpha=0.5, label=label)
+        row[0].set_title(f'{language}: uso de CPU', fontsize=13)
+        row[0].set_ylabel('CPU (%)')
+        row[1].set_title(f'{language}: memoria residente', fontsize=13)
+        row[1].set_ylabel('RSS (MB)')
+        for ax in row:
+            ax.set_xlabel('Tiempo desde el lanzamiento (ms)')
+            ax.legend(title='Entorno')
 
 
 def create_visualizations(all_data):
-    """Crea visualizaciones a partir de los datos"""
+    """Decide qué gráficas comparativas se pueden crear con los datos y las devuelve"""
     print("\nGenerando visualizaciones...")
-    output_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    times = all_data[['environment', 'execution_time']]
+    charts = []
     
     # 1. Comparación directa con gráfico de barras
     print("- Creando gráfico de barras comparativo...")
-    plt.figure(figsize=(10, 6))
-    
-    # Gráfico de barras para comparar tiempos promedio
-    avg_times = all_data.groupby('environment')['execution_time'].mean()
-    
-    ax = avg_times.plot(kind='bar', color=['#3498db', '#e74c3c'])
-    plt.title('Comparación de Tiempo de Ejecución Promedio: Docker vs VM', fontsize=16)
-    plt.xlabel('Entorno', fontsize=14)
-    plt.ylabel('Tiempo de Ejecución (segundos)', fontsize=14)
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
-    
-    # Agregar valores en las barras
-    for i, value in enumerate(avg_times):
-        plt.text(i, value + (value*0.05), f'{value:.3f}s', ha='center', fontweight='bold')
-    
-    plt.tight_layout()
-    bar_chart_path = os.path.join(output_dir, 'comparison_bar_chart.png')
-    plt.savefig(bar_chart_path, dpi=300, bbox_inches='tight')
-    print(f"  Gráfico guardado como: {bar_chart_path}")
+    charts.append(('comparison_bar_chart.png', chart_bar, times))
     
     # 2. Gráfico de caja (Box Plot) para ver la distribución
     if len(all_data) >= 4:  # Se necesitan suficientes puntos para un boxplot útil
         print("- Creando box plot para distribución...")
-        plt.figure(figsize=(10, 6))
-        
-        # Box plot para visualizar la distribución
-        sns.boxplot(x='environment', y='execution_time', data=all_data, palette=['#3498db', '#e74c3c'])
-        
-        # Añadir puntos individuales
-        sns.stripplot(x='environment', y='execution_time', data=all_data, color='black', alpha=0.5, size=6)
-        
-        plt.title('Distribución de Tiempos de Ejecución: Docker vs VM', fontsize=16)
-        plt.xlabel('Entorno', fontsize=14)
-        plt.ylabel('Tiempo de Ejecución (segundos)', fontsize=14)
-        plt.grid(axis='y', linestyle='--', alpha=0.7)
-        
-        plt.tight_layout()
-        boxplot_path = os.path.join(output_dir, 'comparison_boxplot.png')
-        plt.savefig(boxplot_path, dpi=300, bbox_inches='tight')
-        print(f"  Gráfico guardado como: {boxplot_path}")
+        charts.append(('comparison_boxplot.png', chart_boxplot, times))
     else:
         print("  Omitiendo box plot: se necesitan más puntos de datos para un box plot útil")
     
     # 3. Histograma de tiempos de ejecución (solo si hay suficientes puntos)
     if len(all_data) >= 6:  # Se necesitan suficientes puntos para un histograma útil
         print("- Creando histograma de tiempos...")
-        plt.figure(figsize=(12, 7))
-        
-        # Crear histograma para cada entorno
-        for env, color in zip(['Docker', 'VM'], ['#3498db', '#e74c3c']):
-            subset = all_data[all_data['environment'] == env]
-            if not subset.empty and len(subset) >= 3:
-                sns.histplot(subset['execution_time'], kde=True, label=env, color=color, alpha=0.6)
-        
-        plt.title('Distribución de Tiempos de Ejecución: Docker vs VM', fontsize=16)
-        plt.xlabel('Tiempo de Ejecución (segundos)', fontsize=14)
-        plt.ylabel('Frecuencia', fontsize=14)
-        plt.grid(linestyle='--', alpha=0.7)
-        plt.legend()
-        
-        plt.tight_layout()
-        histogram_path = os.path.join(output_dir, 'comparison_histogram.png')
-        plt.savefig(histogram_path, dpi=300, bbox_inches='tight')
-        print(f"  Gráfico guardado como: {histogram_path}")
+        charts.append(('comparison_histogram.png', chart_histogram, times))
     else:
         print("  Omitiendo histograma: se necesitan más puntos de datos para un histograma útil")
     
     # 4. Gráfico de barras con error (si hay suficientes puntos)
     if all_data.groupby('environment').size().min() >= 2:
         print("- Creando gráfico de barras con barras de error...")
-        plt.figure(figsize=(10, 6))
-        
-        # Calcular medias y errores estándar
-        means = all_data.groupby('environment')['execution_time'].mean()
-        errors = all_data.groupby('environment')['execution_time'].sem()
-        
-        # Crear gráfico de barras con barras de error
-        ax = means.plot(kind='bar', yerr=errors, capsize=10, color=['#3498db', '#e74c3c'], 
-                       error_kw={'elinewidth': 2, 'capthick': 2})
-        
-        plt.title('Tiempo de Ejecución Promedio con Error Estándar: Docker vs VM', fontsize=16)
-        plt.xlabel('Entorno', fontsize=14)
-        plt.ylabel('Tiempo de Ejecución (segundos)', fontsize=14)
-        plt.grid(axis='y', linestyle='--', alpha=0.7)
-        
-        # Agregar valores en las barras
-        for i, value in enumerate(means):
-            plt.text(i, value + errors[i] + (value*0.05), f'{value:.3f}s', ha='center', fontweight='bold')
-        
-        plt.tight_layout()
-        error_bars_path = os.path.join(output_dir, 'comparison_error_bars.png')
-        plt.savefig(error_bars_path, dpi=300, bbox_inches='tight')
-        print(f"  Gráfico guardado como: {error_bars_path}")
+        charts.append(('comparison_error_bars.png', chart_error_bars, times))
     else:
         print("  Omitiendo gráfico de barras de error: se necesitan más puntos de datos")
     
@@ -415,28 +766,185 @@ def create_visualizations(all_data):
                     pivot_possible = False
         
         if pivot_possible:
-            plt.figure(figsize=(14, 8))
-            
-            # Preparar datos para gráfico
-            pivoted_data = all_data.pivot_table(index='file', columns='environment', values='execution_time', aggfunc='mean')
-            
-            # Crear gráfico de barras agrupadas
-            ax = pivoted_data.plot(kind='bar', figsize=(14, 8))
-            
-            plt.title('Comparación de Tiempos por Archivo: Docker vs VM', fontsize=16)
-            plt.xlabel('Archivo', fontsize=14)
-            plt.ylabel('Tiempo de Ejecución (segundos)', fontsize=14)
-            plt.grid(axis='y', linestyle='--', alpha=0.7)
-            plt.legend(title='Entorno')
-            
-            plt.xticks(rotation=45, ha='right')
-            plt.tight_layout()
-            by_file_path = os.path.join(output_dir, 'comparison_by_file.png')
-            plt.savefig(by_file_path, dpi=300, bbox_inches='tight')
-            print(f"  Gráfico guardado como: {by_file_path}")
+            charts.append(('comparison_by_file.png', chart_by_file, all_data[['file', 'environment', 'execution_time']]))
         else:
             print("  Omitiendo gráfico por archivo: no hay datos para todos los archivos en ambos entornos")
     else:
         print("  Omitiendo gráfico por archivo: solo hay un archivo")
+    return charts
+
+
+def chart_bar(all_data):
+    plt, _ = plotting()
+    plt.figure(figsize=(10, 6))
+    
+    # Gráfico de barras para comparar tiempos promedio
+    avg_times = all_data.groupby('environment')['execution_time'].mean()
+    
+    avg_times.plot(kind='bar', color=['#3498db', '#e74c3c'])
+    plt.title('Comparación de Tiempo de Ejecución Promedio: Docker vs VM', fontsize=16)
+    plt.xlabel('Entorno', fontsize=14)
+    plt.ylabel('Tiempo de Ejecución (segundos)', fontsize=14)
+    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    
+    # Agregar valores en las barras
+    for i, value in enumerate(avg_times):
+        plt.text(i, value + (value*0.05), f'{value:.3f}s', ha='center', fontweight='bold')
+
+
+def chart_boxplot(all_data):
+    plt, sns = plotting()
+    plt.figure(figsize=(10, 6))
+    
+    # Box plot para visualizar la distribución
+    sns.boxplot(x='environment', y='execution_time', data=all_data, palette=['#3498db', '#e74c3c'])
+    
+    # Añadir puntos individuales
+    sns.stripplot(x='environment', y='execution_time', data=all_data, color='black', alpha=0.5, size=6)
+    
+    plt.title('Distribución de Tiempos de Ejecución: Docker vs VM', fontsize=16)
+    plt.xlabel('Entorno', fontsize=14)
+    plt.ylabel('Tiempo de Ejecución (segundos)', fontsize=14)
+    plt.grid(axis='y', linestyle='--', alpha=0.7)
+
+
+def chart_histogram(all_data):
+    plt, sns = plotting()
+    plt.figure(figsize=(12, 7))
+    
+    # Crear histograma para cada entorno
+    for env, color in zip(['Docker', 'VM'], ['#3498db', '#e74c3c']):
+        subset = all_data[all_data['environment'] == env]
+        if not subset.empty and len(subset) >= 3:
+            sns.histplot(subset['execution_time'], kde=True, label=env, color=color, alpha=0.6)
+    
+    plt.title('Distribución de Tiempos de Ejecución: Docker vs VM', fontsize=16)
+    plt.xlabel('Tiempo de Ejecución (segundos)', fontsize=14)
+    plt.ylabel('Frecuencia', fontsize=14)
+    plt.grid(linestyle='--', alpha=0.7)
+    plt.legend()
+
+
+def chart_error_bars(all_data):
+    plt, _ = plotting()
+    plt.figure(figsize=(10, 6))
+    
+    # Calcular medias y errores estándar
+    means = all_data.groupby('environment')['execution_time'].mean()
+    errors = all_data.groupby('environment')['execution_time'].sem()
+    
+    # Crear gráfico de barras con barras de error
+    means.plot(kind='bar', yerr=errors, capsize=10, color=['#3498db', '#e74c3c'],
+               error_kw={'elinewidth': 2, 'capthick': 2})
+    
+    plt.title('Tiempo de Ejecución Promedio con Error Estándar: Docker vs VM', fontsize=16)
+    plt.xlabel('Entorno', fontsize=14)
+    plt.ylabel('Tiempo de Ejecución (segundos)', fontsize=14)
+    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    
+    # Agregar valores en las barras
+    for i, value in enumerate(means):
+        plt.text(i, value + errors.iloc[i] + (value*0.05), f'{value:.3f}s', ha='center', fontweight='bold')
+
+
+def chart_by_file(all_data):
+    plt, _ = plotting()
+    
+    # Preparar datos para gráfico
+    pivoted_data = all_data.pivot_table(index='file', columns='environment', values='execution_time', aggfunc='mean')
+    
+    # Crear gráfico de barras agrupadas
+    pivoted_data.plot(kind='bar', figsize=(14, 8))
+    
+    plt.title('Comparación de Tiempos por Archivo: Docker vs VM', fontsize=16)
+    plt.xlabel('Archivo', fontsize=14)
+    plt.ylabel('Tiempo de Ejecución (segundos)', fontsize=14)
+    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    plt.legend(title='Entorno')
+    
+    plt.xticks(rotation=45, ha='right')
+
+
+def plotting():
+    """Importa matplotlib (backend Agg) y seaborn y aplica el estilo la primera vez que se dibuja"""
+    global _plotting_modules
+    if _plotting_modules is None:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        plt.style.use('ggplot')
+        sns.set_style("whitegrid")
+        plt.rcParams['figure.figsize'] = (12, 7)
+        plt.rcParams['font.size'] = 12
+        _plotting_modules = plt, sns
+    return _plotting_modules
+
+
+def render_chart(chart, data, path):
+    """Dibuja una gráfica y la guarda en path; se ejecuta en los procesos del pool"""
+    data_modules()
+    plt, _ = plotting()
+    chart(data)
+    plt.tight_layout()
+    plt.savefig(path, dpi=CHART_DPI, bbox_inches='tight')
+    plt.close('all')
+    return path
+
+
+def chart_hash(chart, data):
+    """Hash del código de la gráfica y de sus datos de entrada"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(inspect.getsource(chart).encode())
+    digest.update(f'{CHART_DPI} {list(data.dtypes.items())}'.encode())
+    digest.update(pd.util.hash_pandas_object(data, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def render_charts(charts, workers=None, force=False):
+    """Dibuja en paralelo las gráficas cuyo código o datos cambiaron desde la última ejecución"""
+    output_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    cache_path = os.path.join(output_dir, CHART_CACHE_FILE)
+    cache = _read_index(cache_path)
+    pending = []
+    for filename, chart, data in charts:
+        path = os.path.join(output_dir, filename)
+        digest = chart_hash(chart, data)
+        if not force and cache.get(filename) == digest and os.path.exists(path):
+            print(f"  Sin cambios, se conserva: {path}")
+            continue
+        pending.append((filename, chart, data, path, digest))
+    if not pending:
+        return
+    
+    workers = min(workers or os.cpu_count() or 1, len(pending))
+    print(f"\nDibujando {len(pending)} gráficas con {workers} proceso(s)...")
+    errors = {}
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {filename: executor.submit(render_chart, chart, data, path)
+                       for filename, chart, data, path, _ in pending}
+            for filename, future in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    errors[filename] = e
+    else:
+        for filename, chart, data, path, _ in pending:
+            try:
+                render_chart(chart, data, path)
+            except Exception as e:
+                errors[filename] = e
+    
+    for filename, _, _, path, digest in pending:
+        if filename in errors:
+            print(f"  Error al generar {path}: {errors[filename]}")
+            cache.pop(filename, None)
+        else:
+            cache[filename] = digest
+            print(f"  Gráfico guardado como: {path}")
+    _write_index(cache_path, cache)
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
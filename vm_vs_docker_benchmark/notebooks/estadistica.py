@@ -0,0 +1,185 @@
+"""
+Estadística de los tiempos de ejecución por entorno × lenguaje × n.
+
+Medianas con intervalos de confianza bootstrap, pruebas de Mann-Whitney y de
+permutación para cada par de entornos, y veredictos que indican si una
+diferencia es estadísticamente significativa. Todo el cálculo por grupo está
+vectorizado con NumPy; el único bucle de Python recorre los grupos.
+"""
+
+import itertools
+import math
+
+import numpy as np
+import pandas as pd
+
+# Remuestreos bootstrap y permutaciones por defecto
+RESAMPLES = 10000
+PERMUTATIONS = 10000
+
+# Por encima de este tamaño conjunto la aproximación normal de Mann-Whitney
+# es precisa y la prueba de permutación no aporta nada que justifique su coste
+PERMUTATION_LIMIT = 5000
+
+# Elementos como máximo en cada bloque de permutaciones (memoria acotada)
+BLOCK_ELEMENTS = 1 << 22
+
+
+def bootstrap_medians(sorted_values, resamples=RESAMPLES, rng=None):
+    """Medianas de `resamples` remuestreos bootstrap de una muestra ordenada.
+
+    No hace falta remuestrear: el índice i = floor(m·U) de cada elemento
+    remuestreado es uniforme en 0..m-1, y la mediana del remuestreo es el
+    elemento en floor(m·U_(h)), donde U_(h), el h-ésimo estadístico de orden
+    de m uniformes, sigue una Beta(h, m + 1 - h). Cada mediana cuesta O(1)
+    tras ordenar, sea cual sea el tamaño de la muestra.
+    """
+    rng = rng or np.random.default_rng(0)
+    m = len(sorted_values)
+    h = (m + 1) // 2
+    lower = rng.beta(h, m + 1 - h, resamples)
+    lower_index = np.minimum((lower * m).astype(np.int64), m - 1)
+    if m % 2:
+        return sorted_values[lower_index]
+    # Con m par la mediana promedia U_(h) y U_(h+1); dado U_(h) = u, U_(h+1)
+    # es el mínimo de m - h uniformes en (u, 1)
+    upper = lower + (1 - lower) * rng.beta(1, m - h, resamples)
+    upper_index = np.minimum((upper * m).astype(np.int64), m - 1)
+    return (sorted_values[lower_index] + sorted_values[upper_index]) / 2
+
+
+def percentile_interval(estimates, confidence=0.95):
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(estimates, [alpha, 1 - alpha])
+    return low, high
+
+
+def ranks(values):
+    """Rangos (empezando en 1) con empates promediados y tamaño de cada grupo de empates"""
+    order = np.argsort(values, kind='mergesort')
+    sorted_values = values[order]
+    distinct = np.concatenate(([True], sorted_values[1:] != sorted_values[:-1]))
+    starts = np.flatnonzero(distinct)
+    ties = np.diff(np.append(starts, len(values)))
+    average = starts + (ties + 1) / 2
+    result = np.empty(len(values))
+    result[order] = average[np.cumsum(distinct) - 1]
+    return result, ties
+
+
+def mann_whitney(a, b):
+    """Prueba U de Mann-Whitney bilateral (aproximación normal con corrección por empates)"""
+    n1, n2 = len(a), len(b)
+    rank_values, ties = ranks(np.concatenate([a, b]))
+    u = rank_values[:n1].sum() - n1 * (n1 + 1) / 2
+    total = n1 + n2
+    variance = n1 * n2 / 12 * ((total + 1) - (ties ** 3 - ties).sum() / (total * (total - 1)))
+    if variance <= 0:
+        return u, 1.0
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(variance)
+    return u, min(1.0, math.erfc(max(z, 0) / math.sqrt(2)))
+
+
+def permutation_test(a, b, permutations=PERMUTATIONS, rng=None):
+    """p-valor bilateral de la diferencia de medianas bajo permutaciones de las etiquetas"""
+    rng = rng or np.random.default_rng(0)
+    pooled = np.concatenate([a, b])
+    n1, total = len(a), len(pooled)
+    observed = abs(np.median(a) - np.median(b))
+    # Tolerancia para que las permutaciones idénticas a la observada cuenten como extremas
+    threshold = observed - 1e-12 * max(observed, 1e-300)
+    block = max(1, BLOCK_ELEMENTS // total)
+    extreme = 0
+    done = 0
+    while done < permutations:
+        size = min(block, permutations - done)
+        shuffled = rng.permuted(np.broadcast_to(pooled, (size, total)), axis=1)
+        differences = np.abs(np.median(shuffled[:, :n1], axis=1) - np.median(shuffled[:, n1:], axis=1))
+        extreme += np.count_nonzero(differences >= threshold)
+        done += size
+    return (extreme + 1) / (permutations + 1)
+
+
+def holm(pvalues):
+    """p-valores ajustados por Holm-Bonferroni para comparaciones múltiples"""
+    pvalues = np.asarray(pvalues, dtype=float)
+    count = len(pvalues)
+    if count == 0:
+        return pvalues
+    order = np.argsort(pvalues)
+    adjusted = np.maximum.accumulate((count - np.arange(count)) * pvalues[order])
+    result = np.empty(count)
+    result[order] = np.minimum(adjusted, 1.0)
+    return result
+
+
+def summarize_groups(data, keys=('environment', 'language', 'n'), confidence=0.95, resamples=RESAMPLES,
+                     seed=0):
+    """Mediana e intervalo de confianza bootstrap de execution_time para cada grupo"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for key, group in data.groupby(list(keys), dropna=False, sort=True):
+        values = np.sort(group['execution_time'].to_numpy(dtype=float))
+        values = values[~np.isnan(values)]
+        if not len(values):
+            continue
+        low, high = percentile_interval(bootstrap_medians(values, resamples, rng), confidence)
+        rows.append({**dict(zip(keys, key)), 'samples': len(values), 'median': np.median(values),
+                     'ci_low': low, 'ci_high': high})
+    return pd.DataFrame(rows, columns=[*keys, 'samples', 'median', 'ci_low', 'ci_high'])
+
+
+def compare_environments(data, keys=('language', 'n'), alpha=0.05, resamples=RESAMPLES,
+                         permutations=PERMUTATIONS, seed=0):
+    """Compara cada par de entornos dentro de cada grupo (lenguaje, n).
+
+    La diferencia se expresa en % respecto al primer entorno, con su
+    intervalo bootstrap. Es significativa si el p-valor ajustado por Holm es
+    menor que alpha y el intervalo no contiene el 0.
+    """
+    rng = np.random.default_rng(seed)
+    confidence = 1 - alpha
+    rows = []
+    for key, group in data.groupby(list(keys), dropna=False, sort=True):
+        samples = {env: np.sort(values.to_numpy(dtype=float)[~np.isnan(values.to_numpy(dtype=float))])
+                   for env, values in group.groupby('environment')['execution_time']}
+        for env_a, env_b in itertools.combinations(sorted(samples), 2):
+            a, b = samples[env_a], samples[env_b]
+            row = {**dict(zip(keys, key)), 'env_a': env_a, 'env_b': env_b, 'samples_a': len(a),
+                   'samples_b': len(b)}
+            if len(a) < 2 or len(b) < 2:
+                rows.append(row)
+                continue
+            median_a, median_b = np.median(a), np.median(b)
+            ratio = bootstrap_medians(b, resamples, rng) / bootstrap_medians(a, resamples, rng)
+            low, high = percentile_interval((ratio - 1) * 100, confidence)
+            _, p_mw = mann_whitney(a, b)
+            p_perm = permutation_test(a, b, permutations, rng) if len(a) + len(b) <= PERMUTATION_LIMIT else np.nan
+            row.update({'median_a': median_a, 'median_b': median_b,
+                        'difference_pct': (median_b / median_a - 1) * 100, 'ci_low_pct': low,
+                        'ci_high_pct': high, 'p_mann_whitney': p_mw, 'p_permutation': p_perm,
+                        # Con muestras pequeñas manda la permutación, exacta; si no, Mann-Whitney
+                        'p_value': p_perm if not np.isnan(p_perm) else p_mw})
+            rows.append(row)
+
+    columns = [*keys, 'env_a', 'env_b', 'samples_a', 'samples_b', 'median_a', 'median_b', 'difference_pct',
+               'ci_low_pct', 'ci_high_pct', 'p_mann_whitney', 'p_permutation', 'p_value']
+    comparisons = pd.DataFrame(rows).reindex(columns=columns)
+    tested = comparisons['p_value'].notna()
+    comparisons['p_adjusted'] = np.nan
+    comparisons.loc[tested, 'p_adjusted'] = holm(comparisons.loc[tested, 'p_value'])
+    comparisons['significant'] = (tested & (comparisons['p_adjusted'] < alpha)
+                                  & ((comparisons['ci_low_pct'] > 0) | (comparisons['ci_high_pct'] < 0)))
+    comparisons['verdict'] = [verdict(row, confidence) for row in comparisons.itertuples(index=False)]
+    return comparisons
+
+
+def verdict(row, confidence=0.95):
+    if np.isnan(row.p_value):
+        return (f"Muestras insuficientes para comparar {row.env_a} y {row.env_b} "
+                f"({row.samples_a} y {row.samples_b}; se necesitan al menos 2 por entorno)")
+    interval = f"IC {confidence:.0%}: {row.ci_low_pct:+.1f}% a {row.ci_high_pct:+.1f}%, p ajustado={row.p_adjusted:.3g}"
+    if row.significant:
+        direction = "más lento" if row.difference_pct > 0 else "más rápido"
+        return f"{row.env_b} es {abs(row.difference_pct):.1f}% {direction} que {row.env_a} ({interval})"
+    return f"Sin diferencia significativa entre {row.env_a} y {row.env_b} (Δ {row.difference_pct:+.1f}%, {interval})"
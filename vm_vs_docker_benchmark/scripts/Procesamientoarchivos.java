@@ -0,0 +1,133 @@
+import java.io.BufferedReader;
+import java.io.FileInputStream;
+import java.io.IOException;
+import java.nio.MappedByteBuffer;
+import java.nio.channels.FileChannel;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Paths;
+import java.nio.file.StandardOpenOption;
+
+public class Procesamientoarchivos {
+    // Tamaño de bloque de la estrategia bloques
+    static final int BLOQUE = 1 << 20;
+
+    static long lineas;
+    static long palabras;
+    static long bytes;
+    // El bloque anterior terminó dentro de una palabra
+    static boolean enPalabra;
+
+    static boolean esEspacio(int c) {
+        return c == ' ' || c == '\n' || c == '\t' || c == '\r' || c == 0x0b || c == 0x0c;
+    }
+
+    // ISO-8859-1 hace corresponder cada byte con un carácter, así que la
+    // longitud de la línea más el salto es el número de bytes leídos
+    static void porLineas(String ruta) throws IOException {
+        try (BufferedReader lector = Files.newBufferedReader(Paths.get(ruta), StandardCharsets.ISO_8859_1)) {
+            String linea;
+            while ((linea = lector.readLine()) != null) {
+                lineas++;
+                bytes += linea.length() + 1;
+                boolean dentro = false;
+                for (int i = 0; i < linea.length(); i++) {
+                    boolean espacio = esEspacio(linea.charAt(i));
+                    if (!espacio && !dentro) {
+                        palabras++;
+                    }
+                    dentro = !espacio;
+                }
+            }
+        }
+    }
+
+    static void contar(byte[] datos, int longitud) {
+        long nuevasLineas = 0;
+        long nuevasPalabras = 0;
+        boolean dentro = enPalabra;
+        for (int i = 0; i < longitud; i++) {
+            int c = datos[i];
+            if (c == '\n') {
+                nuevasLineas++;
+            }
+            boolean espacio = esEspacio(c);
+            if (!espacio && !dentro) {
+                nuevasPalabras++;
+            }
+            dentro = !espacio;
+        }
+        lineas += nuevasLineas;
+        palabras += nuevasPalabras;
+        bytes += longitud;
+        enPalabra = dentro;
+    }
+
+    static void contar(MappedByteBuffer datos) {
+        long nuevasLineas = 0;
+        long nuevasPalabras = 0;
+        boolean dentro = enPalabra;
+        int longitud = datos.limit();
+        for (int i = 0; i < longitud; i++) {
+            int c = datos.get(i);
+            if (c == '\n') {
+                nuevasLineas++;
+            }
+            boolean espacio = esEspacio(c);
+            if (!espacio && !dentro) {
+                nuevasPalabras++;
+            }
+            dentro = !espacio;
+        }
+        lineas += nuevasLineas;
+        palabras += nuevasPalabras;
+        bytes += longitud;
+        enPalabra = dentro;
+    }
+
+    static void porBloques(String ruta) throws IOException {
+        byte[] buffer = new byte[BLOQUE];
+        try (FileInputStream entrada = new FileInputStream(ruta)) {
+            int leidos;
+            while ((leidos = entrada.read(buffer)) > 0) {
+                contar(buffer, leidos);
+            }
+        }
+    }
+
+    // Un MappedByteBuffer no pasa de 2 GB: los archivos grandes se mapean por tramos
+    static void porMmap(String ruta) throws IOException {
+        try (FileChannel canal = FileChannel.open(Paths.get(ruta), StandardOpenOption.READ)) {
+            long tamano = canal.size();
+            for (long inicio = 0; inicio < tamano; inicio += Integer.MAX_VALUE) {
+                long longitud = Math.min(Integer.MAX_VALUE, tamano - inicio);
+                contar(canal.map(FileChannel.MapMode.READ_ONLY, inicio, longitud));
+            }
+        }
+    }
+
+    public static void main(String[] args) throws IOException {
+        if (args.length < 1) {
+            System.err.println("Uso: java Procesamientoarchivos <ruta> [lineas|bloques|mmap]");
+            System.exit(2);
+        }
+        String estrategia = args.length > 1 ? args[1] : "bloques";
+        switch (estrategia) {
+            case "lineas":
+                porLineas(args[0]);
+                break;
+            case "bloques":
+                porBloques(args[0]);
+                break;
+            case "mmap":
+                porMmap(args[0]);
+                break;
+            default:
+                System.err.println("Estrategia desconocida: " + estrategia);
+                System.exit(2);
+        }
+        System.out.println("Líneas: " + lineas);
+        System.out.println("Palabras: " + palabras);
+        System.out.println("Bytes: " + bytes);
+    }
+}
@@ -0,0 +1,79 @@
+const fs = require('fs');
+const readline = require('readline');
+
+// Tamaño de bloque de la estrategia bloques. Node no expone mmap en su
+// biblioteca estándar, así que aquí no hay estrategia mmap.
+const BLOQUE = 1 << 20;
+
+function esEspacio(c) {
+    return c === 32 || c === 10 || c === 9 || c === 13 || c === 11 || c === 12;
+}
+
+// latin1 hace corresponder cada byte con un carácter, así que la longitud de
+// la línea más el salto es el número de bytes leídos
+async function porLineas(ruta) {
+    const lector = readline.createInterface({
+        input: fs.createReadStream(ruta, { encoding: 'latin1' }),
+        crlfDelay: Infinity
+    });
+    let lineas = 0;
+    let palabras = 0;
+    let bytes = 0;
+    for await (const linea of lector) {
+        lineas++;
+        bytes += linea.length + 1;
+        let dentro = false;
+        for (let i = 0; i < linea.length; i++) {
+            const espacio = esEspacio(linea.charCodeAt(i));
+            if (!espacio && !dentro) {
+                palabras++;
+            }
+            dentro = !espacio;
+        }
+    }
+    return [lineas, palabras, bytes];
+}
+
+function porBloques(ruta) {
+    const buffer = Buffer.allocUnsafe(BLOQUE);
+    const fd = fs.openSync(ruta, 'r');
+    let lineas = 0;
+    let palabras = 0;
+    let bytes = 0;
+    let dentro = false;
+    try {
+        let leidos;
+        while ((leidos = fs.readSync(fd, buffer, 0, BLOQUE, null)) > 0) {
+            for (let i = 0; i < leidos; i++) {
+                const c = buffer[i];
+                if (c === 10) {
+                    lineas++;
+                }
+                const espacio = esEspacio(c);
+                if (!espacio && !dentro) {
+                    palabras++;
+                }
+                dentro = !espacio;
+            }
+            bytes += leidos;
+        }
+    } finally {
+        fs.closeSync(fd);
+    }
+    return [lineas, palabras, bytes];
+}
+
+async function main() {
+    const [ruta, estrategia = 'bloques'] = process.argv.slice(2);
+    const estrategias = { lineas: porLineas, bloques: porBloques };
+    if (!ruta || !estrategias[estrategia]) {
+        console.error('Uso: node Procesamientoarchivos.js <ruta> [lineas|bloques]');
+        process.exit(2);
+    }
+    const [lineas, palabras, bytes] = await estrategias[estrategia](ruta);
+    console.log(`Líneas: ${lineas}`);
+    console.log(`Palabras: ${palabras}`);
+    console.log(`Bytes: ${bytes}`);
+}
+
+main();
@@ -1,16 +1,118 @@
+import java.io.BufferedReader;
+import java.io.IOException;
+import java.io.InputStreamReader;
+import java.math.BigInteger;
 import java.util.Scanner;
 
 public class Sucesionfibonacci {
-    public static void main(String[] args) {
+    // Evita que el JIT descarte el cálculo en modo worker
+    static volatile long sumidero;
+
+    // long desborda a partir del término 93; con --bigint se usa BigInteger,
+    // que hace el mismo cálculo exacto que Python
+    static long[] sucesion(int n) {
+        long[] terminos = new long[Math.max(n, 0)];
+        long a = 0;
+        long b = 1;
+        for (int i = 0; i < n; i++) {
+            terminos[i] = a;
+            long temp = a + b;
+            a = b;
+            b = temp;
+        }
+        return terminos;
+    }
+
+    static BigInteger[] sucesionGrande(int n) {
+        BigInteger[] terminos = new BigInteger[Math.max(n, 0)];
+        BigInteger a = BigInteger.ZERO;
+        BigInteger b = BigInteger.ONE;
+        for (int i = 0; i < n; i++) {
+            terminos[i] = a;
+            BigInteger temp = a.add(b);
+            a = b;
+            b = temp;
+        }
+        return terminos;
+    }
+
+    // Proceso persistente: cada línea de stdin es una cantidad de términos y se
+    // responde "n tiempo_ns términos" con el tiempo medido dentro de la JVM
+    static void modoWorker(boolean grande) throws IOException {
+        BufferedReader lector = new BufferedReader(new InputStreamReader(System.in));
+        String linea;
+        while ((linea = lector.readLine()) != null) {
+            linea = linea.trim();
+            if (linea.isEmpty()) {
+                continue;
+            }
+            int n = Integer.parseInt(linea);
+            long inicio = System.nanoTime();
+            int longitud;
+            if (grande) {
+                BigInteger[] terminos = sucesionGrande(n);
+                longitud = terminos.length;
+                if (longitud > 0) {
+                    sumidero = terminos[longitud - 1].longValue();
+                }
+            } else {
+                long[] terminos = sucesion(n);
+                longitud = terminos.length;
+                if (longitud > 0) {
+                    sumidero = terminos[longitud - 1];
+                }
+            }
+            long fin = System.nanoTime();
+            System.out.println(n + " " + (fin - inicio) + " " + longitud);
+            System.out.flush();
+        }
+    }
+
+    public static void main(String[] args) throws IOException {
+        boolean worker = false;
+        boolean grande = false;
+        String cantidad = null;
+        for (String arg : args) {
+            if (arg.equals("--worker")) {
+                worker = true;
+            } else if (arg.equals("--bigint")) {
+                grande = true;
+            } else {
+                cantidad = arg;
+            }
+        }
+        if (worker) {
+            modoWorker(grande);
+            return;
+        }
         try (Scanner scanner = new Scanner(System.in)) {
-            System.out.print("Ingrese el número de términos de la sucesión de Fibonacci: ");
-            int n = scanner.nextInt();
+            int n;
+            // Con un argumento en la línea de comandos no se pide nada por teclado
+            if (cantidad != null) {
+                n = Integer.parseInt(cantidad);
+            } else {
+                System.out.print("Ingrese el número de términos de la sucesión de Fibonacci: ");
+                n = scanner.nextInt();
+            }
 
             if (n <= 0) {
                 System.out.println("La cantidad debe ser mayor que cero.");
                 return;
             }
 
+            if (grande) {
+                BigInteger a = BigInteger.ZERO;
+                BigInteger b = BigInteger.ONE;
+
+                for (int i = 0; i < n; i++) {
+                    System.out.print(a + " ");
+                    BigInteger temp = a.add(b);
+                    a = b;
+                    b = temp;
+                }
+                return;
+            }
+
             long a = 0;
             long b = 1;
 
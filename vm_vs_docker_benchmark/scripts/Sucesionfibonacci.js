@@ -1,14 +1,16 @@
-function fibonacciSequence(n) {
+// Los Number pierden precisión a partir del término 79; con --bigint se usa
+// BigInt, que hace el mismo cálculo exacto que Python
+function fibonacciSequence(n, grande = false) {
     const sequence = [];
 
     if (n <= 0) 
     return sequence;
 
-    sequence.push(0);
+    sequence.push(grande ? 0n : 0);
     if (n === 1) 
     return sequence;
 
-    sequence.push(1);
+    sequence.push(grande ? 1n : 1);
     for (let i = 2; i < n; i++) {
         sequence.push(sequence[i - 1] + sequence[i - 2]);
     }
@@ -16,22 +18,51 @@ function fibonacciSequence(n) {
     return sequence;
 }
 
-// Pedir al usuario el número de términos (solo funciona en entorno Node.js)
-const readline = require('readline').createInterface({
-    input: process.stdin,
-    output: process.stdout
-});
-
-readline.question('Ingrese el número de términos de la sucesión de Fibonacci: ', (input) => {
+function imprimirSecuencia(input, grande) {
     const terms = parseInt(input);
 
     if (isNaN(terms) || terms < 0) {
         console.log('Please enter a valid non-negative integer.');
     } else {
-        const sequence = fibonacciSequence(terms);
+        const sequence = fibonacciSequence(terms, grande);
         console.log('Secuencia de Fibonacci:');
         console.log(sequence.join(' '));
     }
+}
+
+// Proceso persistente: cada línea de stdin es una cantidad de términos y se
+// responde "n tiempo_ns términos" con el tiempo medido dentro de Node
+function modoWorker(grande) {
+    const lector = require('readline').createInterface({ input: process.stdin });
+    lector.on('line', (linea) => {
+        linea = linea.trim();
+        if (linea === '') return;
+        const n = parseInt(linea);
+        const inicio = process.hrtime.bigint();
+        const sequence = fibonacciSequence(n, grande);
+        const fin = process.hrtime.bigint();
+        process.stdout.write(`${n} ${fin - inicio} ${sequence.length}\n`);
+    });
+}
 
-    readline.close();
-});
+const argumentos = process.argv.slice(2);
+const grande = argumentos.includes('--bigint');
+const resto = argumentos.filter((arg) => arg !== '--bigint');
+
+if (resto[0] === '--worker') {
+    modoWorker(grande);
+} else if (resto.length > 0) {
+    // Con un argumento en la línea de comandos no se pide nada por teclado
+    imprimirSecuencia(resto[0], grande);
+} else {
+    // Pedir al usuario el número de términos (solo funciona en entorno Node.js)
+    const readline = require('readline').createInterface({
+        input: process.stdin,
+        output: process.stdout
+    });
+
+    readline.question('Ingrese el número de términos de la sucesión de Fibonacci: ', (input) => {
+        imprimirSecuencia(input, grande);
+        readline.close();
+    });
+}
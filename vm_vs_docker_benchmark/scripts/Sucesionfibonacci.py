@@ -1,3 +1,21 @@
+import bisect
+import sys
+import time
+
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+# argparse y decimal no se importan al arrancar: en modo proceso su carga
+# (unos 20 ms) entraría en cada medición, y Java y Node leen argv a mano
+
+# Por debajo de este tamaño str(int) es más rápido que partir el número
+# (y queda lejos del límite de 4300 dígitos de Python 3.11+)
+UMBRAL_BITS_DECIMAL = 1 << 13
+
+FORMATOS = ("dec", "hex", "bin")
+
 def fibonacci_series(length):
     if length <= 0:
         return []
@@ -11,11 +29,382 @@ def fibonacci_series(length):
         series.append(series[-1] + series[-2])
     return series
 
+def fibonacci_pair(n):
+    # Duplicación rápida: F(2k) = F(k)·(2F(k+1) − F(k)) y F(2k+1) = F(k)² + F(k+1)²,
+    # recorriendo los bits de n de más a menos significativo. O(log n) productos.
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * ((b << 1) - a)
+        d = a * a + b * b
+        if bit == "1":
+            a, b = d, c + d
+        else:
+            a, b = c, d
+    return a, b
+
+def fibonacci_term(n):
+    if n < 0:
+        raise ValueError("n debe ser no negativo")
+    return fibonacci_pair(n)[0]
+
+def fibonacci_iter(stop, start=0):
+    # Generador de F(start) .. F(stop - 1) que solo guarda los dos últimos términos
+    if start < 0:
+        raise ValueError("el inicio del rango debe ser no negativo")
+    if stop <= start:
+        return
+    a, b = fibonacci_pair(start) if start else (0, 1)
+    for _ in range(start, stop):
+        yield a
+        a, b = b, a + b
+
+def fibonacci_range(start, stop):
+    # Términos F(start) .. F(stop - 1) sin calcular los anteriores a start
+    return list(fibonacci_iter(stop, start))
+
+# 2**(2**k) como Decimal exacto. Los cortes caen siempre en potencias de dos,
+# así que solo hay O(log bits) entradas y se reutilizan entre todos los términos
+_potencias_de_dos = {}
+
+def _potencia_de_dos(bits):
+    from decimal import Decimal
+    potencia = _potencias_de_dos.get(bits)
+    if potencia is None:
+        potencia = _potencias_de_dos[bits] = Decimal(2) ** bits
+    return potencia
+
+def _a_decimal(x, bits):
+    # x = alto·2^mitad + bajo; la multiplicación de decimal es subcuadrática,
+    # así que el coste total queda por debajo del O(d²) de str(int)
+    from decimal import Decimal
+    if bits <= UMBRAL_BITS_DECIMAL:
+        return Decimal(x)
+    # Mayor potencia de dos por debajo de bits
+    mitad = 1 << ((bits - 1).bit_length() - 1)
+    alto = x >> mitad
+    bajo = x - (alto << mitad)
+    return _a_decimal(alto, bits - mitad) * _potencia_de_dos(mitad) + _a_decimal(bajo, mitad)
+
+def formatear_decimal(x):
+    if x < 0:
+        return "-" + formatear_decimal(-x)
+    if gmpy2 is not None:
+        return gmpy2.mpz(x).digits(10)
+    if x.bit_length() <= UMBRAL_BITS_DECIMAL:
+        return str(x)
+    import decimal
+    with decimal.localcontext() as contexto:
+        # Precisión ilimitada: cualquier redondeo sería un error
+        contexto.prec = decimal.MAX_PREC
+        contexto.Emax = decimal.MAX_EMAX
+        contexto.traps[decimal.Inexact] = True
+        return str(_a_decimal(x, x.bit_length()))
+
+def formatear(x, formato="dec"):
+    # Base 16 es lineal (potencia de dos); base 10 pasa por formatear_decimal
+    return format(x, "x") if formato == "hex" else formatear_decimal(x)
+
+def codificar(x, formato="dec"):
+    # En "bin" cada término va como longitud (uint32 little-endian) seguida
+    # de sus bytes en big-endian, sin prefijo ni separadores
+    if formato == "bin":
+        cuerpo = x.to_bytes((x.bit_length() + 7) // 8, "big")
+        return len(cuerpo).to_bytes(4, "little") + cuerpo
+    return formatear(x, formato).encode("ascii")
+
+class CachePrefijo:
+    """Términos ya calculados, compartidos entre las consultas de un lote.
+
+    Mantiene una ventana densa F(inicio) .. F(fin - 1) que se amplía sumando a
+    partir de sus dos últimos términos. Al superar limite_bytes se descartan
+    los términos más antiguos; cada `paso` índices queda un punto de control
+    (F(i), F(i+1)) desde el que los huecos se reconstruyen por duplicación
+    rápida. Si hay más de max_puntos se duplica el paso y se aclaran.
+    """
+
+    def __init__(self, limite_bytes=64 << 20, paso=1024, max_puntos=256):
+        self.limite_bytes = limite_bytes
+        self.paso = paso
+        self.max_puntos = max_puntos
+        self.ventana = [0, 1]
+        self.inicio = 0
+        self.bytes_ventana = 0
+        self.puntos = {0: (0, 1)}
+        self.claves = [0]
+        self.aciertos = 0
+        self.sumas = 0
+        self.reconstrucciones = 0
+
+    @property
+    def fin(self):
+        return self.inicio + len(self.ventana)
+
+    def _guardar_punto(self, i, par):
+        if i not in self.puntos:
+            bisect.insort(self.claves, i)
+        self.puntos[i] = par
+        if len(self.claves) > self.max_puntos:
+            self.paso *= 2
+            self.claves = [c for c in self.claves if c % self.paso == 0]
+            self.puntos = {c: self.puntos[c] for c in self.claves}
+
+    def _desalojar(self):
+        # Deja la ventana en 3/4 del límite para no desalojar en cada suma;
+        # siempre se conservan los dos últimos términos para seguir ampliando
+        objetivo = self.limite_bytes * 3 // 4
+        quitar = 0
+        while self.bytes_ventana > objetivo and len(self.ventana) - quitar > 2:
+            self.bytes_ventana -= (self.ventana[quitar].bit_length() + 7) // 8
+            quitar += 1
+        del self.ventana[:quitar]
+        self.inicio += quitar
+
+    def _extender(self, hasta):
+        ventana = self.ventana
+        while self.fin < hasta:
+            termino = ventana[-1] + ventana[-2]
+            ventana.append(termino)
+            self.bytes_ventana += (termino.bit_length() + 7) // 8
+            self.sumas += 1
+            anterior = self.fin - 2
+            if anterior % self.paso == 0:
+                self._guardar_punto(anterior, (ventana[-2], ventana[-1]))
+            if self.bytes_ventana > self.limite_bytes:
+                self._desalojar()
+
+    def par(self, n):
+        # (F(n), F(n+1)) desde la base conocida más cercana por debajo de n:
+        # F(m+k) = F(m+1)·F(k) + F(m)·F(k-1)
+        if self.inicio <= n and n + 1 < self.fin:
+            self.aciertos += 1
+            return self.ventana[n - self.inicio], self.ventana[n + 1 - self.inicio]
+        m = self.claves[bisect.bisect_right(self.claves, n) - 1]
+        a, b = self.puntos[m]
+        if m < self.fin - 2 <= n:
+            m, a, b = self.fin - 2, self.ventana[-2], self.ventana[-1]
+        k = n - m
+        if k == 0:
+            return a, b
+        self.reconstrucciones += 1
+        fk, fk1 = fibonacci_pair(k)
+        return b * fk + a * (fk1 - fk), b * fk1 + a * fk
+
+    def termino(self, n):
+        if n < 0:
+            raise ValueError("n debe ser no negativo")
+        return self.par(n)[0]
+
+    def terminos(self, inicio, fin):
+        # F(inicio) .. F(fin - 1), ampliando la ventana hasta fin
+        if inicio < 0:
+            raise ValueError("el inicio del rango debe ser no negativo")
+        if fin <= inicio:
+            return []
+        if inicio > self.fin + self.paso:
+            # Muy por delante de la ventana: sumar todo el hueco no compensa,
+            # así que el rango se calcula aparte y solo queda su punto de control
+            a, b = self.par(inicio)
+            self._guardar_punto(inicio, (a, b))
+            return self._sumar(a, b, fin - inicio)
+        self._extender(fin)
+        if inicio >= self.inicio:
+            self.aciertos += 1
+            return self.ventana[inicio - self.inicio:fin - self.inicio]
+        # Parte ya desalojada: se regenera desde el par reconstruido en inicio
+        a, b = self.par(inicio)
+        corte = min(fin, self.inicio)
+        return self._sumar(a, b, corte - inicio) + self.ventana[:max(0, fin - self.inicio)]
+
+    @staticmethod
+    def _sumar(a, b, cantidad):
+        resultado = []
+        for _ in range(cantidad):
+            resultado.append(a)
+            a, b = b, a + b
+        return resultado
+
+def escribir_stream(terminos, prefijo, salida=None, tamano_bloque=1 << 16, formato="dec"):
+    # Escribe "<prefijo> [t0, t1, ...]" a medida que se generan los términos,
+    # acumulando bytes hasta tamano_bloque antes de cada write. La memoria no
+    # depende de la longitud de la serie y la salida empieza de inmediato.
+    salida = salida or sys.stdout.buffer
+    texto = formato != "bin"
+    bloque = bytearray(prefijo.encode() + b" [") if texto else bytearray()
+    separador = b""
+    for termino in terminos:
+        bloque += separador
+        bloque += codificar(termino, formato)
+        if texto:
+            separador = b", "
+        if len(bloque) >= tamano_bloque:
+            salida.write(bloque)
+            bloque.clear()
+    if texto:
+        bloque += b"]\n"
+    salida.write(bloque)
+    salida.flush()
+
+def atender(peticion, cache=None):
+    # Una petición es "n" (serie de longitud n), "termino n" o "rango i j"
+    partes = peticion.split()
+    if partes[0] == "termino":
+        n = int(partes[1])
+        return n, [cache.termino(n) if cache else fibonacci_term(n)]
+    if partes[0] == "rango":
+        inicio, fin = int(partes[1]), int(partes[2])
+        return fin - inicio, cache.terminos(inicio, fin) if cache else fibonacci_range(inicio, fin)
+    n = int(partes[0])
+    return n, cache.terminos(0, n) if cache else fibonacci_series(n)
+
+def modo_worker():
+    # Proceso persistente: cada línea de stdin es una petición y se responde
+    # "n tiempo_ns términos" con el tiempo medido dentro del propio proceso
+    for linea in sys.stdin:
+        linea = linea.strip()
+        if not linea:
+            continue
+        inicio = time.perf_counter_ns()
+        n, terminos = atender(linea)
+        fin = time.perf_counter_ns()
+        print(n, fin - inicio, len(terminos), flush=True)
+
+def modo_lote(entrada, cache):
+    # Mismo formato de petición y de respuesta que el worker, pero las
+    # consultas comparten la caché; al final se informa del rendimiento
+    consultas = 0
+    inicio_lote = time.perf_counter()
+    for linea in entrada:
+        linea = linea.strip()
+        if not linea:
+            continue
+        inicio = time.perf_counter_ns()
+        n, terminos = atender(linea, cache)
+        fin = time.perf_counter_ns()
+        print(n, fin - inicio, len(terminos))
+        consultas += 1
+    total = time.perf_counter() - inicio_lote
+    print(f"{consultas} consultas en {total:.3f} s ({consultas / total if total else 0:.1f} consultas/s); "
+          f"caché: {cache.aciertos} aciertos, {cache.sumas} términos sumados, "
+          f"{cache.reconstrucciones} reconstrucciones, {len(cache.claves)} puntos de control cada {cache.paso}",
+          file=sys.stderr)
+
+USO = """uso: Sucesionfibonacci.py [n] [opciones]
+
+Sucesión de Fibonacci
+
+  n                 longitud de la serie; si se omite se pide por teclado
+  --worker          atiende peticiones por stdin y responde con el tiempo de cálculo
+  --lote ARCHIVO    atiende las peticiones de ARCHIVO ('-' para stdin) con una caché común
+  --cache-mb MB     memoria máxima de la ventana de términos de la caché en modo lote (por defecto 64)
+  --termino N       imprime solo F(N), calculado por duplicación rápida
+  --rango I J       imprime F(I) .. F(J-1) sin calcular los términos anteriores
+  --stream          genera y escribe los términos por bloques sin guardar la serie en memoria
+  --bigint          aritmética exacta; se acepta por paridad con Java y Node, los int de Python ya lo son
+  --formato FORMATO dec (por defecto), hex o bin: binario crudo con cada término precedido
+                    de su longitud en bytes (uint32 little-endian)"""
+
+class Argumentos:
+    n = None
+    worker = False
+    lote = None
+    cache_mb = 64.0
+    termino = None
+    rango = None
+    stream = False
+    bigint = False
+    formato = "dec"
+
+def error_uso(mensaje):
+    print(USO.splitlines()[0], file=sys.stderr)
+    print(f"Sucesionfibonacci.py: error: {mensaje}", file=sys.stderr)
+    sys.exit(2)
+
+def parse_args(argv=None):
+    # Lectura manual de argv, con los mismos mensajes y código 2 que argparse
+    argv = sys.argv[1:] if argv is None else argv
+    args = Argumentos()
+    valores = {"--lote": 1, "--cache-mb": 1, "--termino": 1, "--rango": 2, "--formato": 1}
+    i = 0
+    while i < len(argv):
+        opcion = argv[i]
+        if opcion in ("-h", "--help"):
+            print(USO)
+            sys.exit(0)
+        if opcion in ("--worker", "--stream", "--bigint"):
+            setattr(args, opcion[2:], True)
+            i += 1
+            continue
+        if opcion in valores:
+            datos = argv[i + 1:i + 1 + valores[opcion]]
+            if len(datos) < valores[opcion]:
+                error_uso(f"{opcion} requiere {'un valor' if valores[opcion] == 1 else 'dos valores'}")
+            i += 1 + valores[opcion]
+            try:
+                if opcion == "--lote":
+                    args.lote = datos[0]
+                elif opcion == "--cache-mb":
+                    args.cache_mb = float(datos[0])
+                elif opcion == "--termino":
+                    args.termino = int(datos[0])
+                elif opcion == "--rango":
+                    args.rango = [int(datos[0]), int(datos[1])]
+                elif datos[0] in FORMATOS:
+                    args.formato = datos[0]
+                else:
+                    error_uso(f"--formato debe ser uno de {', '.join(FORMATOS)}")
+            except ValueError:
+                error_uso(f"valor no válido para {opcion}: {' '.join(datos)}")
+            continue
+        if opcion.startswith("--") or args.n is not None:
+            error_uso(f"argumento no reconocido: {opcion}")
+        try:
+            args.n = int(opcion)
+        except ValueError:
+            error_uso(f"n debe ser un entero: {opcion}")
+        i += 1
+    return args
+
+def leer_longitud(args):
+    # Con un argumento en la línea de comandos no se pide nada por teclado
+    if args.n is not None:
+        return args.n
+    return int(input("Ingrese la longitud de la serie de Fibonacci: "))
+
 def main():
+    args = parse_args()
+    if args.worker:
+        modo_worker()
+        return
+    if args.lote:
+        cache = CachePrefijo(limite_bytes=int(args.cache_mb * (1 << 20)))
+        if args.lote == "-":
+            modo_lote(sys.stdin, cache)
+        else:
+            with open(args.lote, encoding="utf-8") as entrada:
+                modo_lote(entrada, cache)
+        return
+    formato = args.formato
     try:
-        n = int(input("Ingrese la longitud de la serie de Fibonacci: "))
-        series = fibonacci_series(n)
-        print("Serie de Fibonacci:", series)
+        if args.termino is not None:
+            termino = fibonacci_term(args.termino)
+            if formato == "bin":
+                sys.stdout.buffer.write(codificar(termino, formato))
+            else:
+                print(f"F({args.termino}) =", formatear(termino, formato))
+        elif args.rango is not None:
+            inicio, fin = args.rango
+            prefijo = f"Términos {inicio} a {fin - 1} de Fibonacci:"
+            if args.stream:
+                escribir_stream(fibonacci_iter(fin, inicio), prefijo, formato=formato)
+            else:
+                escribir_stream(fibonacci_range(inicio, fin), prefijo, formato=formato)
+        else:
+            n = leer_longitud(args)
+            sys.stdout.flush()
+            if args.stream:
+                escribir_stream(fibonacci_iter(n), "Serie de Fibonacci:", formato=formato)
+            else:
+                escribir_stream(fibonacci_series(n), "Serie de Fibonacci:", formato=formato)
     except ValueError:
         print("Por favor, ingrese un número entero válido.")
 
@@ -0,0 +1,4 @@
+public class Vacio {
+    public static void main(String[] args) {
+    }
+}
@@ -0,0 +1,108 @@
+import contextlib
+import glob
+import os
+import platform
+
+SYS_CPU = "/sys/devices/system/cpu"
+
+
+def parsear_cpus(texto):
+    # Acepta listas como "2,3" o rangos como "2-5" (mismo formato que taskset -c)
+    cpus = set()
+    for parte in texto.split(","):
+        parte = parte.strip()
+        if not parte:
+            continue
+        if "-" in parte:
+            inicio, fin = parte.split("-", 1)
+            cpus.update(range(int(inicio), int(fin) + 1))
+        else:
+            cpus.add(int(parte))
+    return cpus
+
+
+def _leer(ruta):
+    try:
+        with open(ruta, encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def leer_gobernadores():
+    gobernadores = {}
+    for ruta in glob.glob(os.path.join(SYS_CPU, "cpu[0-9]*", "cpufreq", "scaling_governor")):
+        cpu = int(os.path.basename(os.path.dirname(os.path.dirname(ruta)))[3:])
+        gobernadores[cpu] = _leer(ruta)
+    return gobernadores
+
+
+def leer_metadatos_sistema():
+    # Estado de la máquina que condiciona la estabilidad de las mediciones
+    smt = _leer(os.path.join(SYS_CPU, "smt", "active"))
+    return {
+        "host": platform.node(),
+        "kernel": platform.release(),
+        "cpus_totales": os.cpu_count(),
+        "afinidad_disponible": sorted(os.sched_getaffinity(0)),
+        "gobernadores": leer_gobernadores(),
+        "turbo_desactivado": _leer(os.path.join(SYS_CPU, "intel_pstate", "no_turbo")),
+        "smt_activo": None if smt is None else smt == "1",
+        "carga_promedio": os.getloadavg(),
+        "prioridad": os.getpriority(os.PRIO_PROCESS, 0),
+    }
+
+
+def comprobar_ruido(metadatos, cpus, carga_maxima):
+    # Devuelve una lista de avisos; vacía si la máquina parece lo bastante quieta
+    avisos = []
+    carga_por_cpu = metadatos["carga_promedio"][0] / (metadatos["cpus_totales"] or 1)
+    if carga_por_cpu > carga_maxima:
+        avisos.append(f"carga promedio por CPU {carga_por_cpu:.2f} supera el máximo {carga_maxima:.2f}")
+    gobernadores = metadatos["gobernadores"]
+    for cpu in sorted(cpus):
+        gobernador = gobernadores.get(cpu)
+        if gobernador and gobernador != "performance":
+            avisos.append(f"CPU {cpu} usa el gobernador '{gobernador}' en lugar de 'performance'")
+    if metadatos["smt_activo"]:
+        avisos.append("SMT activo: el hermano de cada núcleo elegido puede introducir ruido")
+    if metadatos["turbo_desactivado"] == "0":
+        avisos.append("turbo activo: la frecuencia depende de la temperatura y de la carga")
+    no_disponibles = set(cpus) - set(metadatos["afinidad_disponible"])
+    if no_disponibles:
+        avisos.append(f"CPUs no disponibles para este proceso: {sorted(no_disponibles)}")
+    return avisos
+
+
+def fijar_afinidad(cpus):
+    # sched_setaffinity(0) actúa sobre el hilo que llama; los hijos lo heredan
+    os.sched_setaffinity(0, cpus)
+
+
+@contextlib.contextmanager
+def afinidad_temporal(cpus):
+    """Fija la afinidad solo mientras dura el bloque, para que la herede un hijo lanzado dentro"""
+    if not cpus:
+        yield
+        return
+    anterior = os.sched_getaffinity(0)
+    fijar_afinidad(cpus)
+    try:
+        yield
+    finally:
+        fijar_afinidad(anterior)
+
+
+def ajustar_prioridad(nice):
+    try:
+        os.setpriority(os.PRIO_PROCESS, 0, nice)
+        return True
+    except PermissionError:
+        print(f"Sin permisos para fijar la prioridad {nice}; se mantiene {os.getpriority(os.PRIO_PROCESS, 0)}")
+        return False
+
+
+def orden_intercalado(idiomas, repeticion):
+    # Orden ABBA: las repeticiones impares van en orden y las pares al revés,
+    # de modo que la deriva térmica o de carga no favorece a ningún lenguaje
+    return list(idiomas) if repeticion % 2 == 1 else list(reversed(idiomas))
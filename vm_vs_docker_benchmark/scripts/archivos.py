@@ -0,0 +1,144 @@
+"""Datos de la carga de lectura y procesamiento de archivos.
+
+Genera de forma determinista un archivo de texto de n MB a partir de una
+semilla, guarda junto a él sus conteos (líneas, palabras, bytes) para
+verificar la salida de los programas, y deja el archivo fuera o dentro de la
+caché de páginas antes de cada ejecución medida.
+"""
+
+import argparse
+import json
+import os
+import random
+
+from verificacion import nuevo_hash
+
+SEMILLA = 2025
+
+# Bloque de generación y de lectura al calentar la caché
+BLOQUE = 1 << 20
+
+# Bytes aleatorios -> texto: 32 de cada 256 son espacios (palabras de unas 7
+# letras, a veces separadas por varios espacios) y 4 de cada 256 saltos de
+# línea (líneas de unos 64 bytes). Todo es ASCII, así que los tres lenguajes
+# cuentan igual líneas, palabras y bytes.
+TEXTO = bytes(
+    ord("\n") if c >= 252 else ord(" ") if c >= 220 else ord("a") + c % 26
+    for c in range(256)
+)
+ESPACIOS = b" \t\n\r\x0b\x0c"
+
+
+def ruta_datos(directorio, megas, semilla=SEMILLA):
+    return os.path.join(directorio, f"texto_{megas}MB_s{semilla}.txt")
+
+
+def contar_palabras(bloque, en_palabra):
+    # La primera palabra del bloque no es nueva si continúa la del anterior
+    palabras = len(bloque.split())
+    if en_palabra and bloque[:1] not in ESPACIOS:
+        palabras -= 1
+    return palabras, bloque[-1:] not in ESPACIOS
+
+
+def generar(ruta, megas, semilla=SEMILLA):
+    rng = random.Random(semilla)
+    h = nuevo_hash()
+    conteos = {"lineas": 0, "palabras": 0, "bytes": 0}
+    en_palabra = False
+    restantes = megas << 20
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as f:
+        while restantes:
+            bloque = rng.randbytes(min(BLOQUE, restantes)).translate(TEXTO)
+            restantes -= len(bloque)
+            if not restantes:
+                # Con un salto de línea final todas las estrategias cuentan las mismas líneas
+                bloque = bloque[:-1] + b"\n"
+            palabras, en_palabra = contar_palabras(bloque, en_palabra)
+            conteos["lineas"] += bloque.count(b"\n")
+            conteos["palabras"] += palabras
+            conteos["bytes"] += len(bloque)
+            h.update(bloque)
+            f.write(bloque)
+        # Las páginas quedan limpias y posix_fadvise puede expulsarlas después
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, ruta)
+    metadatos = {**conteos, "megas": megas, "semilla": semilla, "digest": h.hexdigest()}
+    with open(ruta + ".json", "w", encoding="utf-8") as f:
+        json.dump(metadatos, f, indent=2)
+    return metadatos
+
+
+def leer_metadatos(ruta):
+    try:
+        with open(ruta + ".json", encoding="utf-8") as f:
+            metadatos = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not os.path.exists(ruta) or os.path.getsize(ruta) != metadatos["bytes"]:
+        return None
+    return metadatos
+
+
+def preparar_datos(directorio, megas, semilla=SEMILLA):
+    # El archivo se genera una sola vez por directorio, tamaño y semilla
+    os.makedirs(directorio, exist_ok=True)
+    ruta = ruta_datos(directorio, megas, semilla)
+    metadatos = leer_metadatos(ruta)
+    if metadatos is None:
+        print(f"Generando {ruta} ({megas} MB)...")
+        metadatos = generar(ruta, megas, semilla)
+    return ruta, metadatos
+
+
+def conteos_esperados(ruta):
+    metadatos = leer_metadatos(ruta)
+    return [metadatos["lineas"], metadatos["palabras"], metadatos["bytes"]]
+
+
+def vaciar_cache(ruta):
+    # Solo se expulsa el archivo de datos: el runtime arranca igual que en
+    # caliente y la diferencia medida es la lectura. En una VM el anfitrión
+    # puede conservar las páginas en su propia caché.
+    fd = os.open(ruta, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+def calentar_cache(ruta):
+    buffer = bytearray(BLOQUE)
+    with open(ruta, "rb", buffering=0) as f:
+        while f.readinto(buffer):
+            pass
+
+
+def preparar_cache(ruta, estado):
+    if estado == "frio":
+        vaciar_cache(ruta)
+    else:
+        calentar_cache(ruta)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Genera los archivos de texto de la carga de lectura de archivos")
+    parser.add_argument("megas", type=lambda texto: [int(n) for n in texto.split(",")],
+                        help="tamaños en MB separados por comas")
+    parser.add_argument("--directorio", default="../datos", help="directorio de los archivos generados")
+    parser.add_argument("--semilla", type=int, default=SEMILLA)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    for megas in args.megas:
+        ruta, metadatos = preparar_datos(args.directorio, megas, args.semilla)
+        print(f"{ruta}: {metadatos['lineas']} líneas, {metadatos['palabras']} palabras, "
+              f"{metadatos['bytes']} bytes (digest {metadatos['digest']})")
+
+
+if __name__ == "__main__":
+    main()
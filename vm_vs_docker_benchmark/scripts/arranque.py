@@ -0,0 +1,218 @@
+"""Suite de tiempo de arranque de cada runtime.
+
+Lanza los programas vacíos de ``results.null_commands`` en frío (tras vaciar
+la caché de páginas) y en caliente, junto con variantes ajustadas para el
+arranque: ``python3 -S -I``, la JVM con un archivo de Class Data Sharing y Node
+con caché de compilación de V8 o con un snapshot de arranque. Para Python se
+guarda además el desglose de ``-X importtime``.
+"""
+
+import argparse
+import csv
+import os
+import re
+import shutil
+import subprocess
+
+import results
+from results import commands, compilar_java, medir_tiempo, null_commands, null_sources, resumir
+
+# Artefactos generados (archivo CDS, snapshot de Node, caché de compilación)
+BUILD_DIR = ".arranque"
+
+CAMPOS_ARRANQUE = ["idioma", "variante", "estado", "repeticion", "tiempo", "cpu_usuario", "cpu_sistema",
+                   "rss_max_kb", "fallos_mayores", "cache_vaciada", "error"]
+
+IMPORTTIME = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def version_node():
+    try:
+        salida = subprocess.run(["node", "--version"], capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return tuple(int(parte) for parte in salida.strip().lstrip("v").split(".")[:2])
+
+
+def preparar_cds():
+    # -XX:ArchiveClassesAtExit vuelca las clases cargadas por Vacio a un archivo
+    # que las siguientes JVM mapean en lugar de cargarlas y verificarlas
+    archivo = os.path.join(BUILD_DIR, "vacio.jsa")
+    subprocess.run(["java", f"-XX:ArchiveClassesAtExit={archivo}", "Vacio"],
+                   check=True, capture_output=True)
+    return archivo
+
+
+def preparar_snapshot_node():
+    # El snapshot incluye el heap ya inicializado; la función principal vacía
+    # hace que Node no busque un script al arrancar desde el blob
+    entrada = os.path.join(BUILD_DIR, "snapshot_main.js")
+    with open(entrada, "w", encoding="utf-8") as f:
+        f.write("require('v8').startupSnapshot.setDeserializeMainFunction(() => {});\n")
+    blob = os.path.join(BUILD_DIR, "vacio.blob")
+    subprocess.run(["node", "--snapshot-blob", blob, "--build-snapshot", entrada],
+                   check=True, capture_output=True)
+    return blob
+
+
+def definir_variantes(java_compilado):
+    # (idioma, variante) -> (comando, variables de entorno)
+    variantes = {}
+    python = null_commands["python3"]
+    variantes[("python3", "base")] = (python, None)
+    variantes[("python3", "-S -I")] = ([python[0], "-S", "-I"] + python[1:], None)
+
+    if java_compilado:
+        java = null_commands["java"]
+        variantes[("java", "base")] = (java, None)
+        variantes[("java", "sin CDS")] = ([java[0], "-Xshare:off"] + java[1:], None)
+        try:
+            archivo = preparar_cds()
+            variantes[("java", "CDS de la aplicación")] = (
+                [java[0], f"-XX:SharedArchiveFile={archivo}"] + java[1:], None)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"No se pudo crear el archivo CDS: {e}")
+
+    if shutil.which("node"):
+        node = null_commands["javascript"]
+        variantes[("javascript", "base")] = (node, None)
+        version = version_node()
+        if version and version >= (22, 1):
+            cache = os.path.abspath(os.path.join(BUILD_DIR, "node-compile-cache"))
+            variantes[("javascript", "caché de compilación")] = (node, {"NODE_COMPILE_CACHE": cache})
+        else:
+            print("Node < 22.1: se omite la variante con NODE_COMPILE_CACHE")
+        try:
+            blob = preparar_snapshot_node()
+            variantes[("javascript", "snapshot")] = ([node[0], "--snapshot-blob", blob], None)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"No se pudo crear el snapshot de Node: {e}")
+    return variantes
+
+
+def archivos_del_comando(comando):
+    # Ejecutable más los archivos que aparecen como argumento (o tras "=" en opciones)
+    archivos = [shutil.which(comando[0])]
+    archivos += [arg.split("=", 1)[-1] for arg in comando[1:] if os.path.isfile(arg.split("=", 1)[-1])]
+    return [a for a in archivos if a]
+
+
+def vaciar_cache(comando):
+    # Con privilegios se vacía toda la caché de páginas; sin ellos se expulsan
+    # al menos el ejecutable y los archivos que recibe el comando
+    try:
+        os.sync()
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3\n")
+        return "total"
+    except OSError:
+        pass
+    for ruta in archivos_del_comando(comando):
+        try:
+            fd = os.open(os.path.realpath(ruta), os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+        except OSError:
+            continue
+    return "parcial"
+
+
+def medir_variante(idioma, variante, comando, variables, frio, caliente):
+    registros = []
+    planes = [("frio", frio, True), ("calentamiento", 1, False), ("caliente", caliente, False)]
+    for estado, total, vaciar in planes:
+        for repeticion in range(1, total + 1):
+            cache_vaciada = vaciar_cache(comando) if vaciar else ""
+            tiempo, _, error, recursos, _ = medir_tiempo(comando, variables=variables)
+            registros.append({
+                "idioma": idioma,
+                "variante": variante,
+                "estado": estado,
+                "repeticion": repeticion,
+                "tiempo": f"{tiempo:.6f}",
+                "cpu_usuario": f"{recursos['cpu_usuario']:.6f}" if recursos else "",
+                "cpu_sistema": f"{recursos['cpu_sistema']:.6f}" if recursos else "",
+                "rss_max_kb": recursos.get("rss_max_kb", ""),
+                "fallos_mayores": recursos.get("fallos_mayores", ""),
+                "cache_vaciada": cache_vaciada,
+                "error": error or "",
+            })
+    return registros
+
+
+def desglose_importtime(comando, top=15):
+    # -X importtime escribe en stderr una línea por módulo con el tiempo propio
+    # y acumulado en microsegundos
+    proceso = subprocess.run([comando[0], "-X", "importtime"] + comando[1:],
+                             capture_output=True, text=True)
+    modulos = []
+    for linea in proceso.stderr.splitlines():
+        coincidencia = IMPORTTIME.match(linea)
+        if coincidencia:
+            propio, acumulado, sangria, modulo = coincidencia.groups()
+            modulos.append((int(acumulado), int(propio), len(sangria) // 2, modulo))
+    total = sum(propio for _, propio, _, _ in modulos)
+    raices = sorted((m for m in modulos if m[2] == 0), reverse=True)[:top]
+    return total, raices
+
+
+def guardar_importtime(ruta, desgloses):
+    with open(ruta, "w", encoding="utf-8") as f:
+        for variante, (total, raices) in desgloses.items():
+            f.write(f"python3 {variante}: {total / 1000:.3f} ms en imports\n")
+            for acumulado, propio, _, modulo in raices:
+                f.write(f"  {modulo:<30} acumulado {acumulado / 1000:8.3f} ms | propio {propio / 1000:8.3f} ms\n")
+            f.write("\n")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Mide el tiempo de arranque de cada runtime y sus variantes")
+    parser.add_argument("--entorno", default="vm",
+                        help="etiqueta del entorno; los resultados se guardan en ../results-<entorno>")
+    parser.add_argument("--frio", type=int, default=5, help="lanzamientos tras vaciar la caché de páginas")
+    parser.add_argument("--caliente", type=int, default=20, help="lanzamientos con la caché ya caliente")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    results.RESULTS_DIR = f"../results-{args.entorno}"
+    os.makedirs(results.RESULTS_DIR, exist_ok=True)
+    os.makedirs(BUILD_DIR, exist_ok=True)
+
+    java_compilado = "java" in commands and compilar_java(null_sources["java"])
+    variantes = definir_variantes(java_compilado)
+
+    registros = []
+    for (idioma, variante), (comando, variables) in variantes.items():
+        print(f"Midiendo arranque de {idioma} [{variante}]...")
+        medidos = medir_variante(idioma, variante, comando, variables, args.frio, args.caliente)
+        registros.extend(medidos)
+        for estado in ("frio", "caliente"):
+            tiempos = [float(r["tiempo"]) for r in medidos if r["estado"] == estado and not r["error"]]
+            if tiempos:
+                resumen = resumir(tiempos)
+                print(f"  {estado:>8}: mediana {resumen['mediana'] * 1000:.2f} ms, p95 {resumen['p95'] * 1000:.2f} ms")
+            else:
+                errores = {r["error"] for r in medidos if r["estado"] == estado}
+                print(f"  {estado:>8}: sin mediciones válidas ({'; '.join(errores)})")
+
+    ruta = os.path.join(results.RESULTS_DIR, "arranque.csv")
+    with open(ruta, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CAMPOS_ARRANQUE)
+        writer.writeheader()
+        writer.writerows(registros)
+    print(f"Resultados de arranque guardados en {ruta}")
+
+    desgloses = {variante: desglose_importtime(comando)
+                 for (idioma, variante), (comando, _) in variantes.items() if idioma == "python3"}
+    ruta = os.path.join(results.RESULTS_DIR, "arranque_importtime.txt")
+    guardar_importtime(ruta, desgloses)
+    for variante, (total, _) in desgloses.items():
+        print(f"python3 [{variante}]: {total / 1000:.3f} ms en imports (detalle en {ruta})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""Backends de entorno de ejecución.
+
+Cada backend sabe crear el entorno, esperar a que pueda ejecutar un programa,
+envolver los comandos del runner para lanzarlos dentro y destruirlo. Las tres
+fases del ciclo de vida se cronometran por separado de la carga de trabajo,
+que es lo que el README llama "tiempo de inicio del entorno":
+
+- ``host``: el sistema anfitrión, sin coste de creación.
+- ``unshare``: espacios de nombres de Linux (usuario, PID, montajes, red, UTS
+  e IPC) creados con ``unshare`` y ocupados con ``nsenter``.
+- ``docker``: un contenedor de la imagen del Dockerfile; listo cuando
+  ``docker exec`` responde.
+- ``vm``: una máquina de VirtualBox arrancada sin interfaz; lista cuando
+  acepta una sesión SSH.
+- ``simulado``: latencias fijas sin herramientas externas, para probar el
+  runner sin conexión.
+
+Las opciones de cada backend llegan como ``clave=valor`` desde
+``--backend-opcion`` y se pasan tal cual al constructor.
+"""
+
+import os
+import posixpath
+import shlex
+import signal
+import subprocess
+import time
+
+# Pausa entre comprobaciones de disponibilidad: acota el error de la medición de "listo"
+SONDEO = 0.01
+
+# En la VM, el shell remoto anota aquí el PID del programa antes de hacer exec
+PID_REMOTO = "/tmp/proyecto_tic_medido.pid"
+
+
+class ErrorEntorno(RuntimeError):
+    pass
+
+
+def _ejecutar(comando, timeout=None):
+    try:
+        return subprocess.run(comando, capture_output=True, text=True, timeout=timeout)
+    except FileNotFoundError as e:
+        raise ErrorEntorno(f"{comando[0]} no está instalado") from e
+    except subprocess.TimeoutExpired:
+        return subprocess.CompletedProcess(comando, -1, "", "tiempo agotado")
+
+
+def _esperar(comprobar, espera_maxima, sondeo=SONDEO):
+    # Repite la comprobación hasta que tenga éxito o se agote el plazo
+    limite = time.monotonic() + espera_maxima
+    while not comprobar():
+        if time.monotonic() > limite:
+            raise ErrorEntorno(f"el entorno no estuvo listo en {espera_maxima:.0f} s")
+        time.sleep(sondeo)
+
+
+class Anfitrion:
+    """El propio sistema: las tres fases están vacías"""
+    nombre = "host"
+    # Los perfiles se escriben en rutas del runner: solo se recuperan si el entorno ve sus archivos
+    comparte_archivos = True
+    # La caché de páginas de la carga de archivos se vacía o calienta desde el anfitrión
+    comparte_cache = True
+    # Con un envoltorio (nsenter, docker exec, ssh) el PID lanzado no es el del
+    # programa: su /proc no describe la carga y matarlo no la detiene
+    envuelve = False
+    # El rusage de wait4 suma el de los descendientes ya esperados: vale para el
+    # programa si el envoltorio es su padre (nsenter), no si solo es un cliente
+    # de otro proceso que lo lanza (docker exec, ssh)
+    mide_recursos = True
+
+    def crear(self):
+        pass
+
+    def esperar_listo(self):
+        pass
+
+    def envolver(self, comando):
+        return comando
+
+    def terminar(self, pid=None):
+        """Mata el programa lanzado con envolver() que agotó su tiempo"""
+        if pid is not None:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+    def destruir(self):
+        pass
+
+
+class Unshare(Anfitrion):
+    """Espacios de nombres nuevos alrededor de un proceso que solo espera"""
+    nombre = "unshare"
+    envuelve = True
+    ESPACIOS = ["--user", "--pid", "--mount", "--net", "--uts", "--ipc"]
+
+    def __init__(self, espera_maxima=10):
+        self.espera_maxima = float(espera_maxima)
+        self.proceso = None
+        self.pid = None
+
+    def crear(self):
+        # --fork deja a sleep como PID 1 del espacio nuevo; al matarlo muere todo lo que haya dentro
+        try:
+            self.proceso = subprocess.Popen(
+                ["unshare", "--map-root-user", "--fork", "--mount-proc"] + self.ESPACIOS + ["sleep", "infinity"],
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                start_new_session=True)
+        except FileNotFoundError as e:
+            raise ErrorEntorno("unshare no está instalado") from e
+
+    def _hijo(self):
+        if self.proceso.poll() is not None:
+            raise ErrorEntorno(f"unshare terminó con código {self.proceso.returncode}")
+        try:
+            with open(f"/proc/{self.proceso.pid}/task/{self.proceso.pid}/children", encoding="utf-8") as f:
+                hijos = f.read().split()
+        except OSError:
+            return None
+        return int(hijos[0]) if hijos else None
+
+    def esperar_listo(self):
+        def listo():
+            self.pid = self.pid or self._hijo()
+            return self.pid is not None and _ejecutar(self.envolver(["true"])).returncode == 0
+        _esperar(listo, self.espera_maxima)
+
+    def envolver(self, comando):
+        # Entrar en el espacio de montajes cambia el directorio: se conserva el del runner
+        return ["nsenter", f"--target={self.pid}", f"--wd={os.getcwd()}"] + self.ESPACIOS + comando
+
+    def terminar(self, pid=None):
+        # kill -1 dentro del espacio de PID alcanza a todo salvo a su PID 1 (sleep) y al propio shell
+        _ejecutar(self.envolver(["sh", "-c", "kill -KILL -1"]))
+        super().terminar(pid)
+
+    def destruir(self):
+        if self.proceso:
+            try:
+                os.killpg(self.proceso.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            self.proceso.wait()
+            self.proceso = self.pid = None
+
+
+class Docker(Anfitrion):
+    """Contenedor de la imagen del Dockerfile con el directorio de datos de la carga de archivos montado"""
+    nombre = "docker"
+    comparte_archivos = False
+    envuelve = True
+    mide_recursos = False
+
+    def __init__(self, imagen="proyecto-tic", datos="../datos", red="none", espera_maxima=60):
+        self.imagen = imagen
+        self.datos = datos
+        self.red = red
+        self.espera_maxima = float(espera_maxima)
+        self.contenedor = None
+
+    def crear(self):
+        # Los datos se montan donde los buscan los comandos, relativos al WORKDIR /app de la imagen
+        destino = posixpath.normpath(posixpath.join("/app", self.datos))
+        montajes = ["-v", f"{os.path.abspath(self.datos)}:{destino}:ro"] if os.path.isdir(self.datos) else []
+        # docker run -d vuelve cuando el contenedor está creado y arrancado
+        resultado = _ejecutar(["docker", "run", "-d", "--rm", f"--network={self.red}"] + montajes
+                              + [self.imagen, "sleep", "infinity"])
+        if resultado.returncode != 0:
+            raise ErrorEntorno(f"docker run falló: {resultado.stderr.strip()}")
+        self.contenedor = resultado.stdout.strip()
+
+    def esperar_listo(self):
+        _esperar(lambda: _ejecutar(self.envolver(["true"])).returncode == 0, self.espera_maxima)
+
+    def envolver(self, comando):
+        return ["docker", "exec", "-i", self.contenedor] + comando
+
+    def terminar(self, pid=None):
+        # Matar docker exec no detiene el programa: se matan todos los procesos salvo el PID 1
+        _ejecutar(["docker", "exec", self.contenedor, "sh", "-c", "kill -KILL -1"])
+        super().terminar(pid)
+
+    def destruir(self):
+        if self.contenedor:
+            _ejecutar(["docker", "rm", "-f", self.contenedor])
+            self.contenedor = None
+
+
+class MaquinaVirtual(Anfitrion):
+    """Máquina de VirtualBox con el repositorio clonado en ``directorio``; se usa por SSH"""
+    nombre = "vm"
+    comparte_archivos = False
+    comparte_cache = False
+    envuelve = True
+    mide_recursos = False
+
+    def __init__(self, maquina="ubuntu", ssh="usuario@192.168.56.10",
+                 directorio="Proyecto_TIC/vm_vs_docker_benchmark/scripts", espera_maxima=300):
+        self.maquina = maquina
+        self.ssh = ssh
+        self.directorio = directorio
+        self.espera_maxima = float(espera_maxima)
+        self.arrancada = False
+
+    def crear(self):
+        resultado = _ejecutar(["VBoxManage", "startvm", self.maquina, "--type", "headless"])
+        if resultado.returncode != 0:
+            raise ErrorEntorno(f"VBoxManage startvm falló: {resultado.stderr.strip()}")
+        self.arrancada = True
+
+    def _ssh(self, comando):
+        return ["ssh", "-T", "-o", "BatchMode=yes", "-o", "ConnectTimeout=2", self.ssh, comando]
+
+    def esperar_listo(self):
+        # Lista cuando hay login y terminal, como pide el README
+        _esperar(lambda: _ejecutar(self._ssh("true"), timeout=5).returncode == 0, self.espera_maxima, 0.5)
+
+    def envolver(self, comando):
+        # El PID del shell es el del programa tras el exec; terminar() lo usa para matarlo
+        return self._ssh(f"cd {shlex.quote(self.directorio)} && echo $$ > {PID_REMOTO} "
+                         f"&& exec {shlex.join(comando)}")
+
+    def terminar(self, pid=None):
+        # Sin terminal, cerrar la sesión SSH no mata el programa remoto
+        _ejecutar(self._ssh(f"kill -KILL $(cat {PID_REMOTO})"), timeout=10)
+        super().terminar(pid)
+
+    def _apagada(self):
+        salida = _ejecutar(["VBoxManage", "showvminfo", self.maquina, "--machinereadable"]).stdout
+        return 'VMState="poweroff"' in salida
+
+    def destruir(self):
+        if self.arrancada:
+            _ejecutar(["VBoxManage", "controlvm", self.maquina, "acpipowerbutton"])
+            _esperar(self._apagada, self.espera_maxima, 0.5)
+            self.arrancada = False
+
+
+class Simulado(Anfitrion):
+    """Entorno ficticio con latencias fijas (en segundos) que ejecuta en el anfitrión"""
+    nombre = "simulado"
+
+    def __init__(self, creacion=0.05, listo=0.1, destruccion=0.02, fallar=""):
+        self.latencias = {"crear": float(creacion), "esperar_listo": float(listo),
+                          "destruir": float(destruccion)}
+        # Fase en la que simular un fallo, para probar el manejo de errores del runner
+        self.fallar = fallar
+        self.eventos = []
+
+    def _fase(self, fase):
+        self.eventos.append(fase)
+        time.sleep(self.latencias[fase])
+        if fase == self.fallar:
+            raise ErrorEntorno(f"fallo simulado en {fase}")
+
+    def crear(self):
+        self._fase("crear")
+
+    def esperar_listo(self):
+        self._fase("esperar_listo")
+
+    def destruir(self):
+        self._fase("destruir")
+
+
+BACKENDS = {backend.nombre: backend for backend in (Anfitrion, Unshare, Docker, MaquinaVirtual, Simulado)}
+
+
+def crear_backend(nombre, opciones=()):
+    # opciones: lista de "clave=valor" para el constructor del backend
+    argumentos = dict(opcion.split("=", 1) for opcion in opciones)
+    try:
+        return BACKENDS[nombre](**argumentos)
+    except TypeError as e:
+        raise ErrorEntorno(f"opciones no válidas para el backend {nombre}: {e}") from e
+
+
+def cronometrar(funcion):
+    inicio = time.perf_counter()
+    funcion()
+    return time.perf_counter() - inicio
+
+
+def levantar(backend):
+    """Crea el entorno y espera a que esté listo; devuelve los segundos de cada fase"""
+    tiempos = {"creacion": cronometrar(backend.crear)}
+    tiempos["listo"] = cronometrar(backend.esperar_listo)
+    return tiempos
+
+
+def desmontar(backend):
+    """Destruye el entorno sin propagar sus fallos: lo ya medido no debe perderse por ellos"""
+    inicio = time.perf_counter()
+    try:
+        backend.destruir()
+    except ErrorEntorno as e:
+        return {"destruccion": None, "error": f"destrucción: {e}"}
+    return {"destruccion": time.perf_counter() - inicio, "error": ""}
+
+
+def ciclo_vacio(backend):
+    """Crea, espera y destruye el entorno sin carga de trabajo"""
+    try:
+        tiempos = levantar(backend)
+    except ErrorEntorno:
+        desmontar(backend)
+        raise
+    return {**tiempos, **desmontar(backend)}
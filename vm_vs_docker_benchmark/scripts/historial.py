@@ -0,0 +1,348 @@
+"""Historial de ejecuciones en SQLite y detección de regresiones.
+
+El runner añade cada ejecución a ``<resultados>/historial.sqlite`` junto con
+la versión de cada runtime y la revisión de git. ``comparar`` enfrenta la
+última ejecución con una ejecución base y termina con código 1 si algún
+grupo (lenguaje, n, modo, tipo) es significativamente más lento que la base
+por encima de un umbral, para poder bloquear la actualización de una imagen.
+También falla si un grupo de la base no tiene ninguna medición válida en la
+última ejecución: un runtime que ya no arranca no puede pasar el gate. Si
+ningún grupo tiene repeticiones suficientes para la prueba termina con
+código 3: no haber probado nada no equivale a no tener regresiones.
+"""
+
+import argparse
+import json
+import math
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+
+BASE_DATOS = "historial.sqlite"
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    marca_tiempo TEXT,
+    entorno TEXT,
+    host TEXT,
+    kernel TEXT,
+    cpus INTEGER,
+    revision TEXT,
+    versiones TEXT
+);
+CREATE TABLE IF NOT EXISTS mediciones (
+    run_id TEXT REFERENCES runs(run_id),
+    entorno TEXT,
+    idioma TEXT,
+    version TEXT,
+    revision TEXT,
+    n INTEGER,
+    modo TEXT,
+    tipo TEXT,
+    aritmetica TEXT,
+    fase TEXT,
+    repeticion INTEGER,
+    tiempo REAL,
+    cpu_usuario REAL,
+    cpu_sistema REAL,
+    rss_max_kb REAL,
+    correcto TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS mediciones_clave ON mediciones (entorno, idioma, n, version, revision);
+CREATE INDEX IF NOT EXISTS mediciones_run ON mediciones (run_id);
+"""
+
+# Comando que imprime la versión de cada runtime (java la escribe en stderr)
+COMANDOS_VERSION = {
+    "python3": ["python3", "--version"],
+    "java": ["java", "-version"],
+    "javascript": ["node", "--version"],
+}
+
+# Campos de un grupo comparable entre dos ejecuciones
+CLAVE_GRUPO = ("idioma", "n", "modo", "tipo", "aritmetica")
+
+
+def conectar(ruta):
+    conexion = sqlite3.connect(ruta)
+    conexion.row_factory = sqlite3.Row
+    conexion.executescript(ESQUEMA)
+    return conexion
+
+
+def version_runtime(idioma, envolver=None):
+    # envolver: función del backend de entorno que lleva el comando a donde se midió
+    comando = COMANDOS_VERSION.get(idioma)
+    if not comando:
+        return ""
+    try:
+        salida = subprocess.run(envolver(comando) if envolver else comando, capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    lineas = (salida.stdout + salida.stderr).strip().splitlines()
+    return lineas[0].strip() if lineas else ""
+
+
+def revision_git():
+    # Dentro de una imagen sin .git no hay revisión; se guarda vacía
+    try:
+        salida = subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True,
+                                timeout=30, cwd=os.path.dirname(os.path.abspath(__file__)))
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    return salida.stdout.strip() if salida.returncode == 0 else ""
+
+
+def registrar(ruta, run_id, entorno, registros, metadatos, versiones, revision):
+    """Añade una ejecución del runner y todas sus mediciones en una sola transacción"""
+    conexion = conectar(ruta)
+    try:
+        with conexion:
+            conexion.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, min(r["marca_tiempo"] for r in registros), entorno, metadatos["host"],
+                 metadatos["kernel"], metadatos["cpus_totales"], revision,
+                 json.dumps(versiones, sort_keys=True)))
+            conexion.executemany(
+                "INSERT INTO mediciones VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, entorno, r["idioma"], versiones.get(r["idioma"], ""), revision, r["n"] or None,
+                  r["modo"], r["tipo"], r["aritmetica"], r["fase"], r["repeticion"], r["tiempo"],
+                  r.get("cpu_usuario"), r.get("cpu_sistema"), r.get("rss_max_kb"), r.get("correcto", ""),
+                  r.get("error", ""))
+                 for r in registros])
+    finally:
+        conexion.close()
+    return ruta
+
+
+def mann_whitney_mayor(a, b):
+    """p-valor unilateral de que b tienda a ser mayor que a (aproximación normal con empates)"""
+    n1, n2 = len(a), len(b)
+    ordenados = sorted([(valor, 0) for valor in a] + [(valor, 1) for valor in b])
+    suma_b = 0.0
+    correccion = 0
+    i = 0
+    while i < len(ordenados):
+        # Los empates reciben el rango medio del bloque
+        j = i
+        while j < len(ordenados) and ordenados[j][0] == ordenados[i][0]:
+            j += 1
+        rango = (i + j + 1) / 2
+        suma_b += rango * sum(grupo for _, grupo in ordenados[i:j])
+        correccion += (j - i) ** 3 - (j - i)
+        i = j
+    u = suma_b - n2 * (n2 + 1) / 2
+    total = n1 + n2
+    varianza = n1 * n2 / 12 * ((total + 1) - correccion / (total * (total - 1)))
+    if varianza <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(varianza)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def holm(pvalores):
+    """p-valores ajustados por Holm-Bonferroni, en el orden original"""
+    orden = sorted(range(len(pvalores)), key=pvalores.__getitem__)
+    ajustados = [0.0] * len(pvalores)
+    maximo = 0.0
+    for posicion, indice in enumerate(orden):
+        maximo = max(maximo, (len(pvalores) - posicion) * pvalores[indice])
+        ajustados[indice] = min(maximo, 1.0)
+    return ajustados
+
+
+def listar_runs(conexion, entorno=None):
+    consulta = "SELECT r.*, COUNT(m.run_id) AS mediciones FROM runs r LEFT JOIN mediciones m USING (run_id)"
+    parametros = ()
+    if entorno:
+        consulta += " WHERE r.entorno = ?"
+        parametros = (entorno,)
+    consulta += " GROUP BY r.run_id ORDER BY r.marca_tiempo"
+    return conexion.execute(consulta, parametros).fetchall()
+
+
+def elegir_runs(conexion, entorno, actual=None, base="anterior", revision_base=None):
+    """Devuelve (run actual, run base); la base por defecto es la ejecución anterior a la actual"""
+    runs = listar_runs(conexion, entorno)
+    if not runs:
+        raise ValueError(f"no hay ejecuciones{f' del entorno {entorno}' if entorno else ''} en el historial")
+
+    def buscar(prefijo):
+        encontrados = [run for run in runs if run["run_id"].startswith(prefijo)]
+        if len(encontrados) != 1:
+            raise ValueError(f"'{prefijo}' coincide con {len(encontrados)} ejecuciones")
+        return encontrados[0]
+
+    run_actual = buscar(actual) if actual else runs[-1]
+    anteriores = [run for run in runs if run["marca_tiempo"] < run_actual["marca_tiempo"]]
+    if revision_base:
+        candidatos = [run for run in anteriores if run["revision"].startswith(revision_base)]
+        if not candidatos:
+            raise ValueError(f"no hay ejecuciones anteriores con la revisión {revision_base}")
+        return run_actual, candidatos[-1]
+    if base != "anterior":
+        return run_actual, buscar(base)
+    if not anteriores:
+        raise ValueError("no hay una ejecución anterior con la que comparar")
+    return run_actual, anteriores[-1]
+
+
+def tiempos_por_grupo(conexion, run_id):
+    # Solo cuentan las repeticiones sin error y con salida no marcada como
+    # incorrecta, pero todo grupo medido aparece, aunque sea sin tiempos
+    grupos = {}
+    filas = conexion.execute("SELECT * FROM mediciones WHERE run_id = ? AND fase = 'medicion'", (run_id,))
+    for fila in filas:
+        tiempos = grupos.setdefault(tuple(fila[campo] for campo in CLAVE_GRUPO), [])
+        if fila["correcto"] != "no" and not fila["error"]:
+            tiempos.append(fila["tiempo"])
+    return grupos
+
+
+def comparar(conexion, run_actual, run_base, umbral=5.0, alfa=0.05, min_repeticiones=3):
+    """Compara cada grupo de la base con la ejecución actual; devuelve una fila por grupo"""
+    actuales = tiempos_por_grupo(conexion, run_actual["run_id"])
+    bases = tiempos_por_grupo(conexion, run_base["run_id"])
+    filas = []
+    # Un grupo de la base que falta o solo falla en la actual es un fallo del
+    # gate, no un grupo que se pueda ignorar
+    for clave in sorted(bases, key=str):
+        base, actual = bases[clave], actuales.get(clave, [])
+        if not base or not actual:
+            if not base and not actual:
+                veredicto = "sin mediciones válidas en ninguna ejecución"
+            elif not base:
+                veredicto = "sin mediciones válidas en la base"
+            elif clave in actuales:
+                veredicto = "FALLO: sin mediciones válidas"
+            else:
+                veredicto = "FALLO: no se midió"
+            filas.append({**dict(zip(CLAVE_GRUPO, clave)), "repeticiones": (len(base), len(actual)),
+                          "mediana_base": statistics.median(base) if base else None,
+                          "mediana_actual": statistics.median(actual) if actual else None,
+                          "cambio_pct": None, "p": None, "veredicto": veredicto})
+            continue
+        mediana_base, mediana_actual = statistics.median(base), statistics.median(actual)
+        fila = {**dict(zip(CLAVE_GRUPO, clave)), "repeticiones": (len(base), len(actual)),
+                "mediana_base": mediana_base, "mediana_actual": mediana_actual,
+                "cambio_pct": (mediana_actual / mediana_base - 1) * 100 if mediana_base else math.nan,
+                "p": None}
+        if min(len(base), len(actual)) >= min_repeticiones:
+            fila["p"] = mann_whitney_mayor(base, actual)
+        filas.append(fila)
+
+    probadas = [fila for fila in filas if fila["p"] is not None]
+    for fila, ajustado in zip(probadas, holm([fila["p"] for fila in probadas])):
+        fila["p_ajustado"] = ajustado
+    for fila in filas:
+        if "veredicto" in fila:
+            continue
+        if fila["p"] is None:
+            fila["veredicto"] = "muestras insuficientes"
+        elif fila["p_ajustado"] < alfa and fila["cambio_pct"] > umbral:
+            fila["veredicto"] = "REGRESIÓN"
+        elif fila["p_ajustado"] < alfa and fila["cambio_pct"] > 0:
+            fila["veredicto"] = "más lento, bajo el umbral"
+        else:
+            fila["veredicto"] = "sin regresión"
+    return filas
+
+
+def describir_run(run):
+    versiones = ", ".join(f"{idioma} {version}" for idioma, version in json.loads(run["versiones"] or "{}").items())
+    return f"{run['run_id']} ({run['marca_tiempo']}, revisión {run['revision'] or '?'}; {versiones})"
+
+
+def comando_listar(args):
+    conexion = conectar(args.db)
+    for run in listar_runs(conexion, args.entorno):
+        print(f"{describir_run(run)}: {run['mediciones']} mediciones")
+
+
+def comando_comparar(args):
+    conexion = conectar(args.db)
+    try:
+        run_actual, run_base = elegir_runs(conexion, args.entorno, args.actual, args.base, args.revision_base)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 2
+    print(f"Base:   {describir_run(run_base)}")
+    print(f"Actual: {describir_run(run_actual)}")
+    filas = comparar(conexion, run_actual, run_base, args.umbral, args.alfa, args.min_repeticiones)
+    if not filas:
+        print("La ejecución base no tiene ningún grupo (lenguaje, n, modo, tipo) medido.")
+        return 2
+    print(f"\nUmbral {args.umbral:.1f}% con alfa {args.alfa} (Mann-Whitney unilateral, p ajustado por Holm):")
+    for fila in filas:
+        grupo = " ".join(str(fila[campo]) for campo in CLAVE_GRUPO if fila[campo] not in (None, ""))
+        prueba = f"p={fila['p_ajustado']:.3g}" if fila["p"] is not None else f"repeticiones {fila['repeticiones']}"
+        if fila["cambio_pct"] is None:
+            medianas = " -> ".join("-" if mediana is None else f"{mediana:.6f} s"
+                                   for mediana in (fila["mediana_base"], fila["mediana_actual"]))
+            print(f"  {grupo:<40} {medianas} (repeticiones válidas {fila['repeticiones']}): {fila['veredicto']}")
+            continue
+        print(f"  {grupo:<40} {fila['mediana_base']:.6f} s -> {fila['mediana_actual']:.6f} s "
+              f"({fila['cambio_pct']:+.1f}%, {prueba}): {fila['veredicto']}")
+    regresiones = [fila for fila in filas if fila["veredicto"] == "REGRESIÓN"]
+    fallos = [fila for fila in filas if fila["veredicto"].startswith("FALLO")]
+    if regresiones or fallos:
+        if regresiones:
+            print(f"\n{len(regresiones)} regresiones significativas por encima del {args.umbral:.1f}%.")
+        if fallos:
+            print(f"\n{len(fallos)} grupos de la base sin mediciones válidas en la ejecución actual "
+                  f"(fallaron, agotaron el tiempo, dieron una salida incorrecta o no se ejecutaron).")
+        return 1
+    sin_probar = [fila for fila in filas if fila["p"] is None]
+    if len(sin_probar) == len(filas):
+        print(f"\nADVERTENCIA: ningún grupo tiene {args.min_repeticiones} repeticiones en las dos ejecuciones; "
+              f"no se ha probado nada. Repita el runner con --repeticiones {args.min_repeticiones} o más.")
+        return 3
+    if sin_probar:
+        print(f"\nADVERTENCIA: {len(sin_probar)} de {len(filas)} grupos sin repeticiones suficientes "
+              f"o sin mediciones válidas quedan fuera de la prueba.")
+    print("\nSin regresiones significativas.")
+    return 0
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Consulta el historial de ejecuciones y detecta regresiones")
+    parser.add_argument("--entorno", default="vm", help="entorno cuyo historial se consulta")
+    parser.add_argument("--db", default=None,
+                        help=f"base de datos SQLite (por defecto ../results-<entorno>/{BASE_DATOS})")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+    subcomandos.add_parser("listar", help="lista las ejecuciones registradas")
+    comparar_parser = subcomandos.add_parser(
+        "comparar", help="compara la última ejecución con una base; código 1 si hay regresiones, "
+                         "3 si ningún grupo tiene repeticiones suficientes")
+    comparar_parser.add_argument("--actual", default=None, help="run_id (o prefijo) a evaluar; por defecto el último")
+    comparar_parser.add_argument("--base", default="anterior",
+                                 help="run_id (o prefijo) de la base, o 'anterior' para la ejecución previa")
+    comparar_parser.add_argument("--revision-base", default=None,
+                                 help="usa como base la última ejecución anterior con esta revisión de git")
+    comparar_parser.add_argument("--umbral", type=float, default=5.0,
+                                 help="ralentización mínima en %% de la mediana para fallar")
+    comparar_parser.add_argument("--alfa", type=float, default=0.05, help="nivel de significancia")
+    comparar_parser.add_argument("--min-repeticiones", type=int, default=3,
+                                 help="repeticiones mínimas por grupo en cada ejecución para poder probar")
+    args = parser.parse_args()
+    args.db = args.db or os.path.join(f"../results-{args.entorno}", BASE_DATOS)
+    return args
+
+
+def main():
+    args = parse_args()
+    if not os.path.exists(args.db):
+        print(f"Error: no existe {args.db}")
+        return 2
+    if args.comando == "listar":
+        comando_listar(args)
+        return 0
+    return comando_comparar(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+"""Planificador de barridos entorno × lenguaje × tamaño de entrada.
+
+La matriz se describe en un JSON, por ejemplo:
+
+    {
+      "entornos": [
+        {"nombre": "vm"},
+        {"nombre": "docker", "prefijo": ["docker", "exec", "-i", "bench"], "concurrente": true}
+      ],
+      "idiomas": ["python3", "java", "javascript"],
+      "tamanos": [100, 1000, 10000],
+      "repeticiones": 10,
+      "tipo": "serie",
+      "bigint": false,
+      "timeout": 60,
+      "concurrencia": 4
+    }
+
+Un entorno puede declarar un "backend" de entornos.py (con sus "opciones")
+en lugar de un "prefijo" fijo, por ejemplo {"nombre": "aislado", "backend":
+"unshare"}: se crea antes del barrido, sus comandos se lanzan dentro y al
+terminar se destruye; la duración de cada fase queda en
+results-<nombre>/entornos.csv. Un trabajo que agota el tiempo en un backend
+se mata dentro del entorno con todo lo que corre en él: si el entorno es
+"concurrente", los trabajos que se solapaban quedan anotados con su error.
+
+Cada trabajo completado se anota en un archivo de checkpoint, de modo que un
+barrido interrumpido se reanuda donde se quedó. Los trabajos de entornos
+marcados como "concurrente" pueden solaparse hasta el límite de concurrencia;
+el resto se ejecuta de uno en uno para no contaminar las mediciones. Con
+"bigint" los tres lenguajes usan aritmética exacta; cada fila anota cuál usó.
+La salida de cada trabajo pasa por el mismo sumidero que en el runner y la
+columna "correcto" dice si coincide con la serie exacta: sin --bigint, Java
+y Node desbordan en cuanto n supera su rango.
+"""
+
+import argparse
+import asyncio
+import csv
+import itertools
+import json
+import os
+import time
+
+import entornos
+import Sucesionfibonacci
+from results import (aritmetica_nativa, comando_para, commands, compilar_java, enteros_esperados,
+                     guardar_ciclos_entorno, marca_tiempo, nuevo_run_id, tipos_por_idioma)
+from verificacion import TAMANO_BUFFER, Sumidero, digest_enteros
+
+CAMPOS_MATRIZ = ["entorno", "idioma", "tipo", "aritmetica", "n", "repeticion", "tiempo", "codigo", "correcto",
+                 "error"]
+
+
+def cargar_matriz(ruta):
+    with open(ruta, encoding="utf-8") as f:
+        matriz = json.load(f)
+    for clave in ("entornos", "idiomas", "tamanos"):
+        if not matriz.get(clave):
+            raise ValueError(f"La matriz debe definir '{clave}'")
+    desconocidos = set(matriz["idiomas"]) - set(commands)
+    if desconocidos:
+        raise ValueError(f"Lenguajes sin comando definido: {sorted(desconocidos)}")
+    for entorno in matriz["entornos"]:
+        if "backend" in entorno and entorno["backend"] not in entornos.BACKENDS:
+            raise ValueError(f"Backend desconocido en el entorno {entorno['nombre']}: {entorno['backend']}")
+        if "backend" in entorno and "prefijo" in entorno:
+            raise ValueError(f"El entorno {entorno['nombre']} define a la vez 'backend' y 'prefijo'")
+    tipo = matriz.get("tipo", "serie")
+    sin_soporte = [idioma for idioma in matriz["idiomas"] if tipo not in tipos_por_idioma[idioma]]
+    if sin_soporte:
+        raise ValueError(f"Lenguajes que no implementan peticiones de tipo '{tipo}': {sin_soporte}")
+    return matriz
+
+
+def expandir_trabajos(matriz, backends=None):
+    # Producto cartesiano en orden estable, para que el checkpoint sea reproducible
+    backends = backends or {}
+    trabajos = []
+    repeticiones = range(1, matriz.get("repeticiones", 1) + 1)
+    bigint = matriz.get("bigint", False)
+    tipo = matriz.get("tipo", "serie")
+    for entorno, idioma, n, repeticion in itertools.product(
+            matriz["entornos"], matriz["idiomas"], matriz["tamanos"], repeticiones):
+        aritmetica = "bigint" if bigint else aritmetica_nativa[idioma]
+        comando = comando_para(idioma, n, tipo, bigint)
+        backend = backends.get(entorno["nombre"], (None,))[0]
+        if backend:
+            comando = backend.envolver(comando)
+        else:
+            comando = list(entorno.get("prefijo", [])) + comando
+        trabajos.append({
+            # El tipo y la aritmética forman parte del id: cambiarlos en la matriz no reutiliza el checkpoint
+            "id": f"{entorno['nombre']}|{idioma}|{tipo}|{aritmetica}|{n}|{repeticion}",
+            "entorno": entorno["nombre"],
+            "comando": comando,
+            "backend": backend,
+            "concurrente": entorno.get("concurrente", False),
+            "idioma": idioma,
+            "tipo": tipo,
+            "aritmetica": aritmetica,
+            "n": n,
+            "repeticion": repeticion,
+        })
+    return trabajos
+
+
+def levantar_entornos(matriz, backends):
+    # Se rellena sobre el diccionario recibido para poder destruir los ya creados si otro falla
+    for entorno in matriz["entornos"]:
+        if "backend" not in entorno:
+            continue
+        opciones = [f"{clave}={valor}" for clave, valor in entorno.get("opciones", {}).items()]
+        backend = entornos.crear_backend(entorno["backend"], opciones)
+        ciclo = {"marca_tiempo": marca_tiempo(), "ciclo": 1, "con_carga": "si"}
+        try:
+            ciclo.update(entornos.levantar(backend))
+        except entornos.ErrorEntorno:
+            backend.destruir()
+            raise
+        backends[entorno["nombre"]] = (backend, ciclo)
+        print(f"Entorno {entorno['nombre']} ({backend.nombre}) listo: creación {ciclo['creacion']:.3f} s, "
+              f"listo {ciclo['listo']:.3f} s")
+
+
+def destruir_entornos(backends, run_id):
+    for nombre, (backend, ciclo) in backends.items():
+        ciclo.update(entornos.desmontar(backend))
+        directorio = f"../results-{nombre}"
+        os.makedirs(directorio, exist_ok=True)
+        guardar_ciclos_entorno([ciclo], run_id, nombre, backend.nombre, directorio)
+        if ciclo["error"]:
+            print(f"ADVERTENCIA: no se pudo destruir el entorno {nombre} ({ciclo['error']}); puede seguir en marcha")
+        else:
+            print(f"Entorno {nombre} destruido en {ciclo['destruccion']:.3f} s")
+
+
+def cargar_checkpoint(ruta):
+    if not os.path.exists(ruta):
+        return set()
+    completados = set()
+    with open(ruta, encoding="utf-8") as f:
+        for linea in f:
+            linea = linea.strip()
+            if linea:
+                completados.add(json.loads(linea)["id"])
+    return completados
+
+
+class Checkpoint:
+    """Registro de trabajos terminados, una línea JSON por trabajo."""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._archivo = open(ruta, "a", encoding="utf-8")
+
+    def marcar(self, trabajo):
+        self._archivo.write(json.dumps({"id": trabajo["id"]}) + "\n")
+        self._archivo.flush()
+
+    def cerrar(self):
+        self._archivo.close()
+
+
+def comprobar_esquemas(matriz):
+    # Un matriz.csv con otras columnas mezclaría filas de esquemas distintos
+    for entorno in matriz["entornos"]:
+        ruta = os.path.join(f"../results-{entorno['nombre']}", "matriz.csv")
+        if os.path.exists(ruta) and os.path.getsize(ruta):
+            with open(ruta, encoding="utf-8", newline="") as f:
+                if next(csv.reader(f), []) != CAMPOS_MATRIZ:
+                    raise ValueError(f"{ruta} no tiene el esquema esperado; muévalo antes de añadir trabajos")
+
+
+def digests_referencia(trabajos):
+    # Uno por petición distinta, calculado antes de medir nada
+    referencias = {}
+    for trabajo in trabajos:
+        clave = (trabajo["tipo"], trabajo["n"])
+        if clave not in referencias:
+            referencias[clave] = digest_enteros(enteros_esperados(trabajo["n"], trabajo["tipo"]),
+                                                Sucesionfibonacci.formatear_decimal)
+    return referencias
+
+
+def guardar_fila(fila):
+    directorio = f"../results-{fila['entorno']}"
+    os.makedirs(directorio, exist_ok=True)
+    ruta = os.path.join(directorio, "matriz.csv")
+    nuevo = not os.path.exists(ruta)
+    with open(ruta, "a", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CAMPOS_MATRIZ)
+        if nuevo:
+            writer.writeheader()
+        writer.writerow(fila)
+
+
+async def consumir(proceso, sumidero):
+    # La salida se hashea por bloques según llega, sin guardarla entera
+    while True:
+        bloque = await proceso.stdout.read(TAMANO_BUFFER)
+        if not bloque:
+            break
+        sumidero.escribir(bloque)
+    await proceso.wait()
+
+
+async def ejecutar_trabajo(trabajo, timeout, esperado=None):
+    sumidero = Sumidero()
+    start = time.perf_counter()
+    proceso = await asyncio.create_subprocess_exec(
+        *trabajo["comando"],
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT)
+    try:
+        await asyncio.wait_for(consumir(proceso, sumidero), timeout)
+        error = "" if proceso.returncode == 0 else f"código de salida {proceso.returncode}"
+    except asyncio.TimeoutError:
+        if trabajo["backend"]:
+            # Matar el envoltorio (nsenter, docker exec, ssh) deja el programa vivo dentro del entorno
+            await asyncio.to_thread(trabajo["backend"].terminar, proceso.pid)
+        else:
+            proceso.kill()
+        await proceso.wait()
+        error = f"timeout tras {timeout} s"
+    tiempo = time.perf_counter() - start
+    sumidero.cerrar()
+    correcto = "" if error or esperado is None else ("si" if sumidero.digest == esperado else "no")
+    return {
+        "entorno": trabajo["entorno"],
+        "idioma": trabajo["idioma"],
+        "tipo": trabajo["tipo"],
+        "aritmetica": trabajo["aritmetica"],
+        "n": trabajo["n"],
+        "repeticion": trabajo["repeticion"],
+        "tiempo": f"{tiempo:.6f}",
+        "codigo": proceso.returncode,
+        "correcto": correcto,
+        "error": error,
+    }
+
+
+async def ejecutar_matriz(trabajos, checkpoint, timeout, concurrencia, referencias=None):
+    referencias = referencias or {}
+    semaforo = asyncio.Semaphore(concurrencia)
+    total = len(trabajos)
+    hechos = 0
+
+    async def correr(trabajo):
+        nonlocal hechos
+        fila = await ejecutar_trabajo(trabajo, timeout, referencias.get((trabajo["tipo"], trabajo["n"])))
+        guardar_fila(fila)
+        checkpoint.marcar(trabajo)
+        hechos += 1
+        estado = fila["error"] or f"{fila['tiempo']} s" + (" (salida incorrecta)" if fila["correcto"] == "no" else "")
+        print(f"[{hechos}/{total}] {trabajo['id']}: {estado}")
+
+    async def correr_acotado(trabajo):
+        async with semaforo:
+            await correr(trabajo)
+
+    # Los trabajos exclusivos van de uno en uno; los concurrentes se solapan
+    # como máximo 'concurrencia' a la vez
+    for trabajo in [t for t in trabajos if not t["concurrente"]]:
+        await correr(trabajo)
+    await asyncio.gather(*(correr_acotado(t) for t in trabajos if t["concurrente"]))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Ejecuta un barrido declarativo entorno × lenguaje × tamaño")
+    parser.add_argument("matriz", help="archivo JSON con la definición de la matriz")
+    parser.add_argument("--checkpoint", default=None,
+                        help="archivo de checkpoint (por defecto <matriz>.checkpoint.jsonl)")
+    parser.add_argument("--reiniciar", action="store_true",
+                        help="ignora el checkpoint existente y empieza desde cero")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    matriz = cargar_matriz(args.matriz)
+    comprobar_esquemas(matriz)
+    ruta_checkpoint = args.checkpoint or os.path.splitext(args.matriz)[0] + ".checkpoint.jsonl"
+    if args.reiniciar and os.path.exists(ruta_checkpoint):
+        os.remove(ruta_checkpoint)
+
+    if "java" in matriz["idiomas"] and not compilar_java():
+        print("Saltando trabajos de Java debido a errores de compilación")
+        matriz["idiomas"] = [i for i in matriz["idiomas"] if i != "java"]
+
+    trabajos = expandir_trabajos(matriz)
+    completados = cargar_checkpoint(ruta_checkpoint)
+    pendientes = [t for t in trabajos if t["id"] not in completados]
+    print(f"{len(trabajos)} trabajos en la matriz, {len(trabajos) - len(pendientes)} ya completados, "
+          f"{len(pendientes)} pendientes")
+    if not pendientes:
+        return
+
+    referencias = digests_referencia(pendientes)
+    backends = {}
+    try:
+        levantar_entornos(matriz, backends)
+        # Los comandos de los backends solo se conocen cuando el entorno está listo
+        pendientes = [t for t in expandir_trabajos(matriz, backends) if t["id"] not in completados]
+        checkpoint = Checkpoint(ruta_checkpoint)
+        try:
+            asyncio.run(ejecutar_matriz(pendientes, checkpoint, matriz.get("timeout", 60),
+                                        matriz.get("concurrencia", 1), referencias))
+        finally:
+            checkpoint.cerrar()
+    except entornos.ErrorEntorno as e:
+        print(f"No se pudo levantar un entorno de la matriz: {e}")
+    finally:
+        destruir_entornos(backends, nuevo_run_id())
+
+
+if __name__ == "__main__":
+    main()
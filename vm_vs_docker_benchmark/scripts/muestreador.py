@@ -0,0 +1,80 @@
+import csv
+import os
+import threading
+import time
+
+CLK_TCK = os.sysconf("SC_CLK_TCK")
+
+# Columnas de la línea temporal que se guarda por ejecución
+CAMPOS_LINEA_TEMPORAL = ["t_ms", "cpu_s", "rss_kb", "hilos"]
+
+
+class MuestreadorProc(threading.Thread):
+    """Hilo que lee /proc/<pid>/stat y /proc/<pid>/status a intervalos fijos.
+
+    Los descriptores se abren una sola vez y se releen con pread, de modo que
+    cada muestra cuesta dos lecturas cortas sin abrir ni cerrar archivos.
+    """
+
+    def __init__(self, pid, intervalo=0.005):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.intervalo = intervalo
+        self.muestras = []
+        # VmHWM del propio mm del hijo (posterior al exec), a diferencia de ru_maxrss
+        self.pico_rss_kb = 0
+        self._detener = threading.Event()
+        self._inicio = time.perf_counter_ns()
+
+    def _leer(self, fd_stat, fd_status):
+        stat = os.pread(fd_stat, 1024, 0)
+        status = os.pread(fd_status, 4096, 0)
+        if not stat:
+            return None
+        # El nombre del comando puede contener espacios, se parte tras el último ')'
+        campos = stat[stat.rindex(b")") + 2:].split()
+        cpu_ticks = int(campos[11]) + int(campos[12])
+        hilos = int(campos[17])
+        for linea in status.splitlines():
+            if linea.startswith(b"VmHWM:"):
+                self.pico_rss_kb = max(self.pico_rss_kb, int(linea.split()[1]))
+            elif linea.startswith(b"VmRSS:"):
+                return cpu_ticks / CLK_TCK, int(linea.split()[1]), hilos
+        # Un proceso zombi ya no tiene VmRSS: la ejecución terminó
+        return None
+
+    def run(self):
+        try:
+            fd_stat = os.open(f"/proc/{self.pid}/stat", os.O_RDONLY)
+            fd_status = os.open(f"/proc/{self.pid}/status", os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            while True:
+                t_ms = (time.perf_counter_ns() - self._inicio) / 1e6
+                try:
+                    lectura = self._leer(fd_stat, fd_status)
+                except (OSError, ValueError, IndexError):
+                    # El proceso terminó y fue recogido por wait4
+                    break
+                if lectura is None:
+                    break
+                self.muestras.append((round(t_ms, 3), *lectura))
+                if self._detener.wait(self.intervalo):
+                    break
+        finally:
+            os.close(fd_stat)
+            os.close(fd_status)
+
+    def detener(self):
+        self._detener.set()
+        self.join()
+        return self.muestras
+
+
+def guardar_linea_temporal(ruta, muestras):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with open(ruta, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(CAMPOS_LINEA_TEMPORAL)
+        writer.writerows(muestras)
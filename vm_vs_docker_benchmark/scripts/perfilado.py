@@ -0,0 +1,157 @@
+"""Perfilado de cada runtime con su herramienta nativa.
+
+Python se lanza bajo cProfile, Node con ``--cpu-prof`` y la JVM con Java
+Flight Recorder. Cada perfil se normaliza al formato de pilas colapsadas
+(``marco;marco;marco peso``, una pila por línea, de la raíz a la hoja) que
+leen flamegraph.pl, inferno o speedscope, de modo que los tres runtimes se
+comparan con la misma herramienta. Los pesos están en microsegundos; en Java
+son muestras × periodo de muestreo.
+"""
+
+import json
+import os
+import pstats
+import shutil
+import subprocess
+
+# Periodo de muestreo de Node (µs) y de jdk.ExecutionSample con settings=profile (ms)
+INTERVALO_NODE_US = 100
+PERIODO_JFR_MS = 10
+
+# Por debajo de este tiempo (s) no se siguen expandiendo las ramas de cProfile
+TIEMPO_MINIMO_CPROFILE = 1e-6
+
+
+def preparar(idioma, comando, directorio, nombre):
+    """Devuelve el comando bajo el perfilador y la ruta del perfil crudo que dejará"""
+    os.makedirs(directorio, exist_ok=True)
+    runtime, resto = comando[0], comando[1:]
+    if idioma == "python3":
+        crudo = os.path.join(directorio, nombre + ".prof")
+        return [runtime, "-m", "cProfile", "-o", crudo] + resto, crudo
+    if idioma == "javascript":
+        crudo = os.path.join(directorio, nombre + ".cpuprofile")
+        return [runtime, "--cpu-prof", f"--cpu-prof-dir={directorio}", f"--cpu-prof-name={nombre}.cpuprofile",
+                f"--cpu-prof-interval={INTERVALO_NODE_US}"] + resto, crudo
+    if idioma == "java":
+        crudo = os.path.join(directorio, nombre + ".jfr")
+        # Sin -Xlog, JFR anuncia la grabación en stdout y la salida no pasaría la verificación
+        return [runtime, "-Xlog:jfr+startup=error",
+                f"-XX:StartFlightRecording=filename={crudo},settings=profile,dumponexit=true"] + resto, crudo
+    raise ValueError(f"no hay perfilador para {idioma}")
+
+
+def _marco_python(funcion):
+    archivo, linea, nombre = funcion
+    if archivo == "~":
+        return nombre
+    return f"{os.path.basename(archivo)}:{nombre}"
+
+
+def colapsar_cprofile(ruta):
+    # cProfile guarda un grafo de llamadas, no pilas: el tiempo de cada función
+    # se reparte entre sus caminos en proporción a lo que aportó cada llamador.
+    # Es una aproximación; un perfilador de muestreo daría pilas exactas
+    estadisticas = pstats.Stats(ruta).stats
+    llamados = {}
+    for funcion, (_, _, _, _, llamadores) in estadisticas.items():
+        for llamador, datos in llamadores.items():
+            llamados.setdefault(llamador, []).append((funcion, datos[3]))
+    pilas = {}
+
+    def expandir(funcion, pila, camino, tiempo):
+        _, _, propio, total, _ = estadisticas[funcion]
+        fraccion = min(tiempo / total, 1.0) if total else 0.0
+        pila = pila + (_marco_python(funcion),)
+        if propio * fraccion:
+            pilas[pila] = pilas.get(pila, 0) + propio * fraccion * 1e6
+        # Las llamadas recursivas ya están contadas en el tiempo del primer marco
+        hijos = [(hijo, tiempo_hijo * fraccion) for hijo, tiempo_hijo in llamados.get(funcion, ())
+                 if hijo not in camino]
+        # Los hijos no pueden sumar más que el tiempo de su llamador en este camino
+        suma = sum(tiempo_hijo for _, tiempo_hijo in hijos)
+        escala = min(1.0, max(tiempo - propio * fraccion, 0.0) / suma) if suma else 0.0
+        for hijo, tiempo_hijo in hijos:
+            if tiempo_hijo * escala >= TIEMPO_MINIMO_CPROFILE:
+                expandir(hijo, pila, camino | {hijo}, tiempo_hijo * escala)
+
+    # Son raíces las funciones con llamadas que ningún llamador registrado
+    # explica, como el exec con el que cProfile lanza el script
+    for funcion, (_, llamadas, _, total, llamadores) in estadisticas.items():
+        if llamadas > sum(datos[0] for datos in llamadores.values()):
+            expandir(funcion, (), {funcion}, total)
+    return pilas
+
+
+def colapsar_cpuprofile(ruta):
+    with open(ruta, encoding="utf-8") as f:
+        perfil = json.load(f)
+    nodos = {nodo["id"]: nodo for nodo in perfil["nodes"]}
+    padres = {hijo: nodo["id"] for nodo in perfil["nodes"] for hijo in nodo.get("children", ())}
+    pesos = {}
+    for muestra, delta in zip(perfil["samples"], perfil["timeDeltas"]):
+        pesos[muestra] = pesos.get(muestra, 0) + max(delta, 0)
+    pilas = {}
+    for nodo, peso in pesos.items():
+        pila = []
+        while nodo in nodos:
+            marco = nodos[nodo]["callFrame"]
+            if marco["functionName"] != "(root)":
+                archivo = os.path.basename(marco["url"])
+                nombre = marco["functionName"] or "(anónima)"
+                pila.append(f"{archivo}:{nombre}" if archivo else nombre)
+            nodo = padres.get(nodo)
+        pila = tuple(reversed(pila))
+        pilas[pila] = pilas.get(pila, 0) + peso
+    return pilas
+
+
+def herramienta_jfr():
+    java = shutil.which("java")
+    candidatos = [shutil.which("jfr")]
+    if os.environ.get("JAVA_HOME"):
+        candidatos.append(os.path.join(os.environ["JAVA_HOME"], "bin", "jfr"))
+    if java:
+        candidatos.append(os.path.join(os.path.dirname(os.path.realpath(java)), "jfr"))
+    return next((c for c in candidatos if c and os.path.exists(c)), None)
+
+
+def colapsar_jfr(ruta):
+    # jfr print --json vuelca cada muestra con su pila, de la hoja a la raíz
+    jfr = herramienta_jfr()
+    if not jfr:
+        raise RuntimeError("no se encontró la herramienta jfr del JDK para convertir la grabación")
+    salida = subprocess.run([jfr, "print", "--json", "--events", "jdk.ExecutionSample", ruta],
+                            capture_output=True, text=True, check=True).stdout
+    pilas = {}
+    for evento in json.loads(salida)["recording"]["events"]:
+        marcos = (evento["values"].get("stackTrace") or {}).get("frames", [])
+        pila = tuple(f"{marco['method']['type']['name']}.{marco['method']['name']}" for marco in reversed(marcos))
+        if pila:
+            pilas[pila] = pilas.get(pila, 0) + PERIODO_JFR_MS * 1000
+    return pilas
+
+
+def colapsar(crudo):
+    extension = os.path.splitext(crudo)[1]
+    convertidores = {".prof": colapsar_cprofile, ".cpuprofile": colapsar_cpuprofile, ".jfr": colapsar_jfr}
+    return convertidores[extension](crudo)
+
+
+def guardar_colapsado(pilas, ruta):
+    with open(ruta, "w", encoding="utf-8") as f:
+        for pila, peso in sorted(pilas.items()):
+            if round(peso):
+                # Los separadores del formato no pueden aparecer dentro de un marco
+                f.write(";".join(marco.replace(";", ":").replace(" ", "_") for marco in pila))
+                f.write(f" {round(peso)}\n")
+    return ruta
+
+
+def mas_costosos(pilas, cantidad=5):
+    """Marcos con más tiempo propio (hoja de la pila) y su porcentaje del total"""
+    total = sum(pilas.values()) or 1
+    propios = {}
+    for pila, peso in pilas.items():
+        propios[pila[-1]] = propios.get(pila[-1], 0) + peso
+    return [(marco, peso / total * 100) for marco, peso in sorted(propios.items(), key=lambda e: -e[1])[:cantidad]]
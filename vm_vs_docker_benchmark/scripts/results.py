@@ -1,10 +1,74 @@
+import argparse
+import csv
+import itertools
+import json
+import select
+import statistics
 import subprocess
 import time
 import os
+import resource
+import uuid
+from datetime import datetime, timezone
+
+import aislamiento
+import archivos
+import entornos
+import historial
+import perfilado
+import Sucesionfibonacci
+from muestreador import MuestreadorProc, guardar_linea_temporal
+from verificacion import TAMANO_BUFFER, Sumidero, digest_enteros
 
 RESULTS_DIR = "../results-vm"
 os.makedirs(RESULTS_DIR, exist_ok=True)
 
+# CPUs para los procesos hijos en modo aislado (None: sin fijar afinidad)
+CPUS_HIJO = None
+
+# Tiempo máximo por ejecución en segundos (None: sin límite)
+TIMEOUT = None
+
+# Backend de entorno en el que se lanzan los programas (ver entornos.py)
+ENTORNO = entornos.Anfitrion()
+
+# Copia íntegra de la salida de cada ejecución en disco (por defecto solo se
+# conserva el principio y el digest de los enteros impresos)
+GUARDAR_SALIDA = False
+
+# Digests de la salida esperada por petición, compartidos entre ejecuciones
+# en RESULTS_DIR/referencias.json
+REFERENCIAS = {}
+
+# Tamaño de entrada de referencia y barrido por órdenes de magnitud. La serie
+# completa imprime unos 0,1·n² dígitos (~1 GB en n = 10^5, ~10^11 en 10^6) y
+# su digest de referencia crece como n^2,8 (8 s en 3·10^4, minutos en 10^5):
+# su barrido se queda en 10^5 y solo termino y rango llegan a 10^6
+N_POR_DEFECTO = 100
+BARRIDO = [100, 1000, 10000, 100000, 1000000]
+MAXIMO_SERIE = 100000
+BARRIDO_SERIE = [n for n in BARRIDO if n <= MAXIMO_SERIE]
+
+# Tipo de petición: serie completa de n términos, solo F(n), o los términos
+# n .. n + ANCHO_RANGO - 1. Solo Python implementa termino y rango.
+TIPO = "serie"
+ANCHO_RANGO = 100
+tipos_por_idioma = {
+    "python3": {"serie", "termino", "rango"},
+    "java": {"serie"},
+    "javascript": {"serie"}
+}
+
+# Aritmética de cada programa por defecto: long de Java y Number de Node
+# desbordan o pierden precisión pasado el término 92/78, Python es exacto.
+# Con BIGINT los tres reciben --bigint y hacen el mismo cálculo exacto.
+BIGINT = False
+aritmetica_nativa = {
+    "python3": "bigint",
+    "java": "int64",
+    "javascript": "float64"
+}
+
 # Archivos fuente por lenguaje
 sources = {
     "python3": "Sucesionfibonacci.py",
@@ -19,9 +83,87 @@ commands = {
     "javascript": ["node", sources["javascript"]]
 }
 
-def compilar_java():
+# Segunda carga de trabajo: lectura y procesamiento de un archivo de texto
+# generado de n MB (con ella, n es el tamaño del archivo en MB). Cada
+# estrategia de lectura se mide con el archivo fuera de la caché de páginas
+# (frio) y dentro (caliente); Node no tiene mmap en su biblioteca estándar.
+CARGA = "fibonacci"
+ESTRATEGIAS = ["lineas", "bloques", "mmap"]
+ESTADOS_CACHE = ["frio", "caliente"]
+DIR_DATOS = "../datos"
+BARRIDO_ARCHIVOS = [64, 256, 1024, 4096]
+estrategias_por_idioma = {
+    "python3": {"lineas", "bloques", "mmap"},
+    "java": {"lineas", "bloques", "mmap"},
+    "javascript": {"lineas", "bloques"}
+}
+
+archivos_sources = {
+    "python3": "Procesamientoarchivos.py",
+    "java": "Procesamientoarchivos.java",
+    "javascript": "Procesamientoarchivos.js"
+}
+
+archivos_commands = {
+    "python3": ["python3", archivos_sources["python3"]],
+    "java": ["java", "Procesamientoarchivos"],
+    "javascript": ["node", archivos_sources["javascript"]]
+}
+
+# Programas nulos para calibrar: /bin/true mide solo el lanzamiento del arnés y
+# los scripts vacíos miden el arranque de cada runtime sin carga de trabajo
+null_sources = {
+    "python3": "Vacio.py",
+    "java": "Vacio.java",
+    "javascript": "Vacio.js"
+}
+
+null_commands = {
+    "arnes": ["/bin/true"],
+    "python3": ["python3", null_sources["python3"]],
+    "java": ["java", "Vacio"],
+    "javascript": ["node", null_sources["javascript"]]
+}
+
+# Recursos del hijo que devuelve wait4 (ru_maxrss está en KB en Linux)
+CAMPOS_RECURSOS = {
+    "cpu_usuario": "ru_utime",
+    "cpu_sistema": "ru_stime",
+    "rss_max_kb": "ru_maxrss",
+    "cambios_voluntarios": "ru_nvcsw",
+    "cambios_involuntarios": "ru_nivcsw",
+    "fallos_menores": "ru_minflt",
+    "fallos_mayores": "ru_majflt",
+}
+
+# Columnas de los archivos de muestras crudas (una fila por ejecución)
+CAMPOS_MUESTRA = ["idioma", "modo", "tipo", "aritmetica", "n", "fase", "repeticion", "tiempo", *CAMPOS_RECURSOS,
+                  "rss_arnes_kb", "digest", "correcto", "error"]
+
+# Almacén estructurado: una fila por ejecución con un esquema fijo. El archivo
+# solo crece; cada invocación del runner se distingue por su run_id
+ALMACEN = "ejecuciones.csv"
+CAMPOS_ALMACEN = ["run_id", "marca_tiempo", "entorno", "host", "kernel", "cpus", "idioma", "aritmetica",
+                  "modo", "tipo", "n", "fase", "repeticion", "tiempo", "cpu_usuario", "cpu_sistema",
+                  "rss_max_kb", "rss_arnes_kb", "cambios_voluntarios", "cambios_involuntarios", "fallos_menores",
+                  "fallos_mayores", "digest", "correcto", "error"]
+TIPOS_ALMACEN = {
+    "run_id": "string", "entorno": "string", "host": "string", "kernel": "string", "cpus": "Int64",
+    "idioma": "string", "aritmetica": "string", "modo": "string", "tipo": "string", "n": "Int64",
+    "fase": "string", "repeticion": "Int64", "tiempo": "float64", "cpu_usuario": "float64",
+    "cpu_sistema": "float64", "rss_max_kb": "float64", "rss_arnes_kb": "float64",
+    "cambios_voluntarios": "Int64", "cambios_involuntarios": "Int64", "fallos_menores": "Int64",
+    "fallos_mayores": "Int64", "digest": "string", "correcto": "string", "error": "string",
+}
+
+# Ciclos de vida del entorno: una fila por creación, con la duración de cada fase
+CICLOS_ENTORNO = "entornos.csv"
+CAMPOS_ENTORNO = ["run_id", "marca_tiempo", "entorno", "backend", "ciclo", "con_carga", "creacion", "listo",
+                  "destruccion", "error"]
+
+def compilar_java(fuente=sources["java"]):
     try:
-        subprocess.run(["javac", sources["java"]], check=True)
+        subprocess.run(["javac", fuente], check=True)
         print("Compilación de Java completada con éxito")
         return True
     except subprocess.CalledProcessError as e:
@@ -31,34 +173,700 @@ def compilar_java():
         print("Archivo Java no encontrado.")
         return False
 
-def medir_tiempo(comando):
+def lanzar_proceso(comando, entrada="100\n", intervalo_muestreo=None, variables=None, sumidero=None):
+    # posix_spawn evita la maquinaria de subprocess (fork del intérprete, hilos
+    # de comunicación, decodificación de texto); el tiempo se cierra en cuanto
+    # wait4 recoge al hijo
+    entrada_r, entrada_w = os.pipe()
+    salida_r, salida_w = os.pipe()
+    acciones = [
+        (os.POSIX_SPAWN_DUP2, entrada_r, 0),
+        (os.POSIX_SPAWN_DUP2, salida_w, 1),
+        (os.POSIX_SPAWN_DUP2, salida_w, 2),
+    ]
+    # Al hacer exec, el kernel vuelca en ru_maxrss el pico del mm reemplazado, que con
+    # el vfork de posix_spawn es el del arnés: ru_maxrss nunca baja de este valor
+    rss_arnes = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # El hijo hereda la afinidad del hilo que lo lanza: se cambia solo durante el spawn
+    with aislamiento.afinidad_temporal(CPUS_HIJO):
+        start = time.perf_counter_ns()
+        try:
+            pid = os.posix_spawnp(comando[0], comando, {**os.environ, **(variables or {})},
+                                  file_actions=acciones)
+        finally:
+            os.close(entrada_r)
+            os.close(salida_w)
+    muestreador = None
+    # Con un backend que envuelve el comando, /proc del PID lanzado sería el del envoltorio
+    if intervalo_muestreo and not ENTORNO.envuelve:
+        muestreador = MuestreadorProc(pid, intervalo_muestreo)
+        muestreador.start()
+    try:
+        os.write(entrada_w, entrada.encode())
+    except BrokenPipeError:
+        pass
+    finally:
+        os.close(entrada_w)
+    # La salida pasa por un buffer fijo al sumidero, que solo guarda el
+    # principio y el hash de los enteros, sin acumularla en memoria
+    sumidero = sumidero or Sumidero()
+    buffer = bytearray(TAMANO_BUFFER)
+    vista = memoryview(buffer)
+    limite = time.monotonic() + TIMEOUT if TIMEOUT else None
+    agotado = False
+    try:
+        while True:
+            if limite is not None:
+                listos, _, _ = select.select([salida_r], [], [], max(limite - time.monotonic(), 0))
+                if not listos:
+                    ENTORNO.terminar(pid)
+                    agotado = True
+                    break
+            leidos = os.readv(salida_r, [buffer])
+            if not leidos:
+                break
+            sumidero.escribir(vista[:leidos])
+    finally:
+        os.close(salida_r)
+    _, status, rusage = os.wait4(pid, 0)
+    end = time.perf_counter_ns()
+    # El muestreador se detiene fuera de la región medida
+    linea_temporal = muestreador.detener() if muestreador else None
+    codigo = os.waitstatus_to_exitcode(status)
+    error = str(subprocess.CalledProcessError(codigo, comando)) if codigo != 0 else None
+    if agotado:
+        error = str(subprocess.TimeoutExpired(comando, TIMEOUT))
+    sumidero.cerrar()
+    output = sumidero.texto()
+    # Tras docker exec o ssh, wait4 describe al cliente y no al programa: sin datos antes que datos ajenos
+    recursos = {}
+    if ENTORNO.mide_recursos:
+        recursos = extraer_recursos(rusage, rss_arnes, muestreador.pico_rss_kb if muestreador else None)
+    return (end - start) / 1e9, output, error, recursos, linea_temporal
+
+def extraer_recursos(rusage, rss_arnes=None, pico_muestreado=None):
+    recursos = {campo: getattr(rusage, atributo) for campo, atributo in CAMPOS_RECURSOS.items()}
+    if rss_arnes is not None:
+        recursos["rss_arnes_kb"] = rss_arnes
+        # Si ru_maxrss no supera el pico del arnés, el del hijo queda oculto; el
+        # VmHWM muestreado de /proc es entonces la mejor estimación disponible.
+        # Sin muestreo el pico es desconocido y se deja vacío en lugar de atribuirle el del arnés
+        if recursos["rss_max_kb"] <= rss_arnes:
+            recursos["rss_max_kb"] = pico_muestreado or None
+    return recursos
+
+def medir_tiempo(comando, intervalo_muestreo=None, variables=None, sumidero=None):
+    comando = ENTORNO.envolver(comando)
+    if hasattr(os, "posix_spawnp") and hasattr(os, "wait4"):
+        return lanzar_proceso(comando, intervalo_muestreo=intervalo_muestreo, variables=variables,
+                              sumidero=sumidero)
+    # Alternativa portable para plataformas sin posix_spawn/wait4
     start = time.perf_counter()
     try:
-        output = subprocess.check_output(comando, stderr=subprocess.STDOUT, text=True, input="100\n")
+        output = subprocess.check_output(comando, stderr=subprocess.STDOUT, text=True, input="100\n",
+                                         timeout=TIMEOUT, env={**os.environ, **(variables or {})})
         error = None
     except subprocess.CalledProcessError as e:
         output = e.output
         error = str(e)
+    except subprocess.TimeoutExpired as e:
+        # subprocess solo mata al envoltorio; el programa dentro del entorno sigue vivo
+        ENTORNO.terminar()
+        output = (e.output or b"").decode("utf-8", errors="replace")
+        error = str(e)
     end = time.perf_counter()
     tiempo = end - start
-    return tiempo, output, error
+    sumidero = sumidero or Sumidero()
+    sumidero.escribir(output.encode())
+    sumidero.cerrar()
+    return tiempo, sumidero.texto(), error, {}, None
+
+def percentil(valores, p):
+    # Percentil con interpolación lineal entre las muestras ordenadas
+    ordenados = sorted(valores)
+    if len(ordenados) == 1:
+        return ordenados[0]
+    posicion = (len(ordenados) - 1) * p / 100
+    inferior = int(posicion)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    fraccion = posicion - inferior
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * fraccion
+
+def formatear_rss(rss_kb):
+    return "desconocido (use --muestreo-ms)" if rss_kb is None else f"{rss_kb:.0f} KB"
+
+def resumir_recursos(registros):
+    # Mediana de cada métrica de recursos sobre las repeticiones medidas
+    medidos = [r for r in registros if r["fase"] == "medicion" and "cpu_usuario" in r]
+    if not medidos:
+        return {}
+    resumen = {}
+    for campo in CAMPOS_RECURSOS:
+        valores = [r[campo] for r in medidos if r[campo] is not None]
+        resumen[campo] = statistics.median(valores) if valores else None
+    return resumen
+
+def resumir(tiempos):
+    mediana = statistics.median(tiempos)
+    return {
+        "n": len(tiempos),
+        "mediana": mediana,
+        "p95": percentil(tiempos, 95),
+        "mad": statistics.median(abs(t - mediana) for t in tiempos),
+        "min": min(tiempos),
+        "max": max(tiempos),
+    }
+
+def aritmetica(idioma):
+    if CARGA != "fibonacci":
+        return ""
+    return "bigint" if BIGINT else aritmetica_nativa.get(idioma, "")
+
+# Cada variante medida llega como (tipo, cache): en la carga de archivos "tipo"
+# es la estrategia de lectura y "cache" el estado de la caché; en Fibonacci
+# "cache" no se usa y sin tipo vale el de la línea de comandos
+def tipo_registro(tipo=None, cache=None):
+    tipo = tipo or TIPO
+    return tipo if CARGA == "fibonacci" else f"archivos_{tipo}_{cache}"
+
+def describir(n, tipo=None, cache=None):
+    if CARGA == "fibonacci":
+        return f"n={n}"
+    return f"{n} MB, {tipo or TIPO}, caché {cache}"
+
+def contexto(n, modo, idioma, tipo=None, cache=None):
+    return ", ".join(parte for parte in (describir(n, tipo, cache), modo, aritmetica(idioma)) if parte)
 
-def guardar_resultados(idioma, tiempo, output, error):
-    nombre_archivo = os.path.join(RESULTS_DIR, f"resultado_{idioma}.txt")
+def etiqueta(idioma, n, modo="proceso", tipo=None, cache=None):
+    # El tamaño de referencia conserva los nombres de archivo originales
+    registro = tipo_registro(tipo, cache)
+    nombre = idioma if registro == "serie" else f"{idioma}_{registro}"
+    if idioma in aritmetica_nativa and aritmetica(idioma) not in ("", aritmetica_nativa[idioma]):
+        nombre = f"{nombre}_{aritmetica(idioma)}"
+    nombre = nombre if n is None or n == N_POR_DEFECTO else f"{nombre}_n{n}"
+    return nombre if modo == "proceso" else f"{nombre}_{modo}"
+
+def peticion_para(n, tipo=None):
+    # Misma petición que entiende el modo worker: "n", "termino n" o "rango i j"
+    tipo = tipo or TIPO
+    if tipo == "termino":
+        return ["termino", str(n)]
+    if tipo == "rango":
+        return ["rango", str(n), str(n + ANCHO_RANGO)]
+    return [str(n)]
+
+def comando_para(idioma, n, tipo=None, bigint=None):
+    if CARGA == "archivos":
+        return archivos_commands[idioma] + [archivos.ruta_datos(DIR_DATOS, n), tipo or TIPO]
+    # Los programas reciben n como argumento y no piden nada por teclado
+    peticion = peticion_para(n, tipo)
+    opciones = ["--bigint"] if (BIGINT if bigint is None else bigint) else []
+    if len(peticion) == 1:
+        return commands[idioma] + peticion + opciones
+    return commands[idioma] + [f"--{peticion[0]}"] + peticion[1:] + opciones
+
+def enteros_esperados(n, tipo=None):
+    # Enteros que imprime un programa correcto para la petición, incluidos los
+    # de la cabecera de Python ("F(n) =", "Términos i a j")
+    if CARGA == "archivos":
+        # Líneas, palabras y bytes, guardados al generar el archivo
+        return archivos.conteos_esperados(archivos.ruta_datos(DIR_DATOS, n))
+    tipo = tipo or TIPO
+    if tipo == "termino":
+        return [n, Sucesionfibonacci.fibonacci_term(n)]
+    if tipo == "rango":
+        return itertools.chain([n, n + ANCHO_RANGO - 1],
+                               Sucesionfibonacci.fibonacci_iter(n + ANCHO_RANGO, n))
+    return Sucesionfibonacci.fibonacci_iter(n)
+
+def digest_referencia(n, tipo=None):
+    # Se calcula una vez por petición, fuera de la región medida
+    if CARGA == "archivos":
+        return digest_enteros(enteros_esperados(n))
+    tipo = tipo or TIPO
+    ruta = os.path.join(RESULTS_DIR, "referencias.json")
+    if not REFERENCIAS and os.path.exists(ruta):
+        with open(ruta, encoding="utf-8") as f:
+            REFERENCIAS.update(json.load(f))
+    clave = f"{tipo}:{n}" if tipo != "rango" else f"{tipo}:{n}:{ANCHO_RANGO}"
+    if clave not in REFERENCIAS:
+        REFERENCIAS[clave] = digest_enteros(enteros_esperados(n, tipo), Sucesionfibonacci.formatear_decimal)
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(REFERENCIAS, f, indent=2, sort_keys=True)
+    return REFERENCIAS[clave]
+
+def marca_tiempo():
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+def medir_repeticion(idioma, comando, fase, repeticion, intervalo_muestreo=None, n=None, tipo=None, cache=None):
+    nombre = etiqueta(idioma, n, tipo=tipo, cache=cache)
+    ruta_copia = None
+    if GUARDAR_SALIDA:
+        ruta_copia = os.path.join(RESULTS_DIR, "salidas", f"{nombre}_{fase}_{repeticion}.txt")
+        os.makedirs(os.path.dirname(ruta_copia), exist_ok=True)
+    sumidero = Sumidero(ruta_copia)
+    esperado = digest_referencia(n, tipo) if n is not None else None
+    if CARGA == "archivos" and n is not None:
+        archivos.preparar_cache(archivos.ruta_datos(DIR_DATOS, n), cache)
+    tiempo, output, error, recursos, linea_temporal = medir_tiempo(comando, intervalo_muestreo,
+                                                                   sumidero=sumidero)
+    if linea_temporal:
+        ruta = os.path.join(RESULTS_DIR, "timelines", f"{nombre}_{fase}_{repeticion}.csv")
+        guardar_linea_temporal(ruta, linea_temporal)
+    registro = {
+        "marca_tiempo": marca_tiempo(),
+        "idioma": idioma,
+        "modo": "proceso",
+        "tipo": tipo_registro(tipo, cache) if n is not None else "",
+        "aritmetica": aritmetica(idioma) if n is not None else "",
+        "n": n if n is not None else "",
+        "fase": fase,
+        "repeticion": repeticion,
+        "tiempo": tiempo,
+        **recursos,
+        "digest": sumidero.digest,
+        "correcto": "" if esperado is None or error else ("si" if sumidero.digest == esperado else "no"),
+        "error": error or "",
+    }
+    return registro, output, error
+
+def ejecutar_repeticiones(idioma, comando, calentamiento, repeticiones, intervalo_muestreo=None, n=None,
+                          tipo=None, cache=None):
+    # Las ejecuciones de calentamiento se registran pero no entran en el resumen
+    registros = []
+    output, error = "", None
+    fases = [("calentamiento", calentamiento), ("medicion", repeticiones)]
+    for fase, total in fases:
+        for repeticion in range(1, total + 1):
+            registro, output, error = medir_repeticion(idioma, comando, fase, repeticion, intervalo_muestreo, n,
+                                                       tipo, cache)
+            registros.append(registro)
+    return registros, output, error
+
+def perfilar(idioma, n, run_id, tipo=None, cache=None):
+    # Una ejecución más bajo el perfilador nativo del runtime; su tiempo incluye
+    # la sobrecarga del perfilador, por eso va en la fase "perfil" y no en el resumen
+    directorio = os.path.join(RESULTS_DIR, "perfiles", run_id)
+    nombre = etiqueta(idioma, n, tipo=tipo, cache=cache)
+    comando, crudo = perfilado.preparar(idioma, comando_para(idioma, n, tipo), directorio, nombre)
+    registro, _, error = medir_repeticion(idioma, comando, "perfil", 1, n=n, tipo=tipo, cache=cache)
+    if error or not os.path.exists(crudo):
+        print(f"Sin perfil de {idioma} ({describir(n, tipo, cache)}): {error or 'el perfilador no generó ' + crudo}")
+        return registro
+    try:
+        pilas = perfilado.colapsar(crudo)
+    except (RuntimeError, ValueError, KeyError, subprocess.CalledProcessError) as e:
+        print(f"Perfil de {idioma} ({describir(n, tipo, cache)}) guardado sin convertir en {crudo}: {e}")
+        return registro
+    ruta = perfilado.guardar_colapsado(pilas, os.path.join(directorio, nombre + ".folded"))
+    costosos = ", ".join(f"{marco} {porcentaje:.1f}%" for marco, porcentaje in perfilado.mas_costosos(pilas, 3))
+    print(f"Perfil de {idioma} ({describir(n, tipo, cache)}) en {ruta}: {costosos}")
+    return registro
+
+def ejecutar_worker(idioma, calentamiento, repeticiones, n=N_POR_DEFECTO, tipo=None):
+    # Un único proceso atiende todas las peticiones; el tiempo lo mide el
+    # propio programa, por lo que excluye el arranque del runtime y la E/S
+    opciones = ["--worker"] + (["--bigint"] if BIGINT else [])
+    with aislamiento.afinidad_temporal(CPUS_HIJO):
+        proceso = subprocess.Popen(ENTORNO.envolver(commands[idioma] + opciones), stdin=subprocess.PIPE,
+                                   stdout=subprocess.PIPE, text=True, bufsize=1)
+    registros = []
+    error = None
+    fases = [("calentamiento", calentamiento), ("medicion", repeticiones)]
+    try:
+        for fase, total in fases:
+            for repeticion in range(1, total + 1):
+                proceso.stdin.write(" ".join(peticion_para(n, tipo)) + "\n")
+                proceso.stdin.flush()
+                # Cada petición recibe una sola línea, así que el buffer está vacío y select es fiable
+                listos, _, _ = select.select([proceso.stdout], [], [], TIMEOUT)
+                if not listos:
+                    ENTORNO.terminar(proceso.pid)
+                    error = str(subprocess.TimeoutExpired(proceso.args, TIMEOUT))
+                    break
+                respuesta = proceso.stdout.readline().split()
+                if len(respuesta) < 2:
+                    error = f"El worker de {idioma} terminó sin responder (código {proceso.poll()})"
+                    break
+                registros.append({
+                    "marca_tiempo": marca_tiempo(),
+                    "idioma": idioma,
+                    "modo": "worker",
+                    "tipo": tipo or TIPO,
+                    "aritmetica": aritmetica(idioma),
+                    "n": n,
+                    "fase": fase,
+                    "repeticion": repeticion,
+                    "tiempo": int(respuesta[1]) / 1e9,
+                    "error": "",
+                })
+            if error:
+                break
+    finally:
+        proceso.stdin.close()
+        proceso.wait()
+        proceso.stdout.close()
+    return registros, "", error
+
+def ejecutar_intercalado(idiomas, calentamiento, repeticiones, intervalo_muestreo=None, n=N_POR_DEFECTO,
+                         tipo=None, cache=None):
+    # Alterna los lenguajes en cada repetición (A B, B A, ...) en lugar de
+    # agotar todas las repeticiones de uno antes de pasar al siguiente
+    resultados = {idioma: ([], "", None) for idioma in idiomas}
+    fases = [("calentamiento", calentamiento), ("medicion", repeticiones)]
+    for fase, total in fases:
+        for repeticion in range(1, total + 1):
+            for idioma in aislamiento.orden_intercalado(idiomas, repeticion):
+                registro, output, error = medir_repeticion(
+                    idioma, comando_para(idioma, n, tipo), fase, repeticion, intervalo_muestreo, n, tipo, cache)
+                resultados[idioma] = (resultados[idioma][0] + [registro], output, error)
+    return resultados
+
+def preparar_entorno(args):
+    # Los ciclos sin carga dan varias muestras del arranque del entorno; el
+    # último ciclo deja el entorno listo para las mediciones
+    opciones = [f"datos={args.dir_datos}"] if args.backend == "docker" else []
+    backend = entornos.crear_backend(args.backend, opciones + args.backend_opcion)
+    ciclos = []
+    for ciclo in range(1, args.ciclos_entorno + 1):
+        ciclos.append({"marca_tiempo": marca_tiempo(), "ciclo": ciclo, "con_carga": "no",
+                       **entornos.ciclo_vacio(backend)})
+    ciclo = {"marca_tiempo": marca_tiempo(), "ciclo": args.ciclos_entorno + 1, "con_carga": "si"}
+    try:
+        ciclo.update(entornos.levantar(backend))
+    except entornos.ErrorEntorno:
+        backend.destruir()
+        raise
+    return backend, ciclos + [ciclo]
+
+def preparar_aislamiento(args, run_id=None):
+    # Fija la afinidad y prioridad del arnés, registra el estado de la máquina
+    # y decide si hay demasiado ruido para medir
+    global CPUS_HIJO
+    cpus_arnes = aislamiento.parsear_cpus(args.cpus_arnes) if args.cpus_arnes else None
+    cpus_hijo = aislamiento.parsear_cpus(args.cpus_hijo) if args.cpus_hijo else None
+    metadatos = aislamiento.leer_metadatos_sistema()
+    avisos = aislamiento.comprobar_ruido(metadatos, (cpus_arnes or set()) | (cpus_hijo or set()),
+                                         args.carga_maxima)
+    for aviso in avisos:
+        print(f"ADVERTENCIA: {aviso}")
+    if avisos and args.estricto:
+        print("Máquina demasiado ruidosa para medir en modo estricto; abortando.")
+        return None
+    if cpus_arnes:
+        aislamiento.fijar_afinidad(cpus_arnes)
+    if args.prioridad is not None:
+        aislamiento.ajustar_prioridad(args.prioridad)
+    CPUS_HIJO = cpus_hijo
+    metadatos.update({
+        "run_id": run_id,
+        "cpus_arnes": sorted(cpus_arnes) if cpus_arnes else None,
+        "cpus_hijo": sorted(cpus_hijo) if cpus_hijo else None,
+        "prioridad_final": os.getpriority(os.PRIO_PROCESS, 0),
+        "intercalado": args.intercalado,
+        "avisos": avisos,
+    })
+    with open(os.path.join(RESULTS_DIR, "metadatos_ejecucion.json"), "w", encoding="utf-8") as f:
+        json.dump(metadatos, f, indent=2, ensure_ascii=False)
+    return metadatos
+
+def calibrar(repeticiones, java_compilado):
+    # Mide los programas nulos para separar la sobrecarga del arnés y el
+    # arranque del runtime del tiempo atribuible a la carga de trabajo
+    calibracion = {}
+    registros = []
+    for nombre, comando in null_commands.items():
+        if nombre in null_sources and not os.path.exists(null_sources[nombre]):
+            print(f"Programa nulo de {nombre} no encontrado, saltando calibración...")
+            continue
+        if nombre == "java" and not java_compilado:
+            continue
+        muestras, _, error = ejecutar_repeticiones(nombre, comando, 1, repeticiones)
+        if error:
+            print(f"Error al calibrar {nombre}: {error}")
+            continue
+        for registro in muestras:
+            registro["fase"] = "calibracion_" + registro["fase"]
+        registros.extend(muestras)
+        calibracion[nombre] = resumir([r["tiempo"] for r in muestras if r["fase"] == "calibracion_medicion"])
+        print(f"Calibración {nombre}: mediana {calibracion[nombre]['mediana']:.6f} s")
+    guardar_muestras("calibracion", registros, "calibracion.csv")
+    return calibracion
+
+def formatear_registro(registro, decimales=6):
+    fila = {**registro, "tiempo": f"{registro['tiempo']:.{decimales}f}"}
+    for campo in ("cpu_usuario", "cpu_sistema"):
+        if campo in fila:
+            fila[campo] = f"{fila[campo]:.6f}"
+    return fila
+
+def guardar_muestras(idioma, registros, nombre=None):
+    nombre_archivo = os.path.join(RESULTS_DIR, nombre or f"muestras_{idioma}.csv")
+    with open(nombre_archivo, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CAMPOS_MUESTRA, extrasaction="ignore")
+        writer.writeheader()
+        for registro in registros:
+            writer.writerow(formatear_registro(registro))
+
+def nuevo_run_id():
+    # Ordenable por fecha y único aunque dos runners arranquen en el mismo segundo
+    return time.strftime("%Y%m%dT%H%M%SZ", time.gmtime()) + "-" + uuid.uuid4().hex[:6]
+
+def guardar_almacen(registros, run_id, entorno, metadatos):
+    ruta = os.path.join(RESULTS_DIR, ALMACEN)
+    nuevo = not os.path.exists(ruta) or os.path.getsize(ruta) == 0
+    if not nuevo:
+        with open(ruta, encoding="utf-8", newline="") as f:
+            cabecera = next(csv.reader(f), [])
+        if cabecera != CAMPOS_ALMACEN:
+            raise ValueError(f"{ruta} no tiene el esquema esperado; muévalo antes de añadir ejecuciones")
+    comunes = {
+        "run_id": run_id,
+        "entorno": entorno,
+        "host": metadatos["host"],
+        "kernel": metadatos["kernel"],
+        "cpus": metadatos["cpus_totales"],
+    }
+    with open(ruta, "a", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CAMPOS_ALMACEN, extrasaction="ignore")
+        if nuevo:
+            writer.writeheader()
+        for registro in registros:
+            # Nanosegundos: el modo worker mide cálculos de unos pocos microsegundos
+            writer.writerow({**formatear_registro(registro, decimales=9), **comunes})
+    return ruta
+
+def guardar_ciclos_entorno(ciclos, run_id, entorno, backend, directorio=None):
+    ruta = os.path.join(directorio or RESULTS_DIR, CICLOS_ENTORNO)
+    nuevo = not os.path.exists(ruta) or os.path.getsize(ruta) == 0
+    with open(ruta, "a", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CAMPOS_ENTORNO)
+        if nuevo:
+            writer.writeheader()
+        for ciclo in ciclos:
+            # Una fase que falló queda vacía; el motivo va en la columna error
+            fases = {fase: "" if ciclo.get(fase) is None else f"{ciclo[fase]:.6f}"
+                     for fase in ("creacion", "listo", "destruccion")}
+            writer.writerow({**ciclo, **fases, "run_id": run_id, "entorno": entorno, "backend": backend})
+    return ruta
+
+def exportar_parquet(ruta):
+    # Copia columnar opcional del almacén completo; requiere pandas y pyarrow
+    try:
+        import pandas as pd
+        datos = pd.read_csv(ruta, dtype=TIPOS_ALMACEN, parse_dates=["marca_tiempo"])
+        destino = os.path.splitext(ruta)[0] + ".parquet"
+        datos.to_parquet(destino, index=False)
+    except ImportError as e:
+        print(f"No se pudo exportar a Parquet: {e}")
+        return None
+    return destino
+
+def estado_verificacion(registros):
+    estados = [r.get("correcto", "") for r in registros]
+    if "no" in estados:
+        return f"INCORRECTA en {estados.count('no')} de {len(estados)} repeticiones"
+    if "si" in estados:
+        return f"correcta (digest {registros[0]['digest']})"
+    return None
+
+def guardar_resultados(idioma, tiempo, output, error, resumen=None, calibracion=None, recursos=None,
+                       n=N_POR_DEFECTO, modo="proceso", verificacion=None, tipo=None, cache=None):
+    nombre_archivo = os.path.join(RESULTS_DIR, f"resultado_{etiqueta(idioma, n, modo, tipo, cache)}.txt")
     with open(nombre_archivo, "w", encoding="utf-8") as f:
-        f.write(f"Tiempo de ejecución: {tiempo:.6f} segundos\n\n")
-        f.write("Salida del programa:\n")
+        f.write(f"Tiempo de ejecución: {tiempo:.6f} segundos\n")
+        if resumen:
+            f.write(f"Repeticiones: {resumen['n']} | mediana: {resumen['mediana']:.6f} | "
+                    f"p95: {resumen['p95']:.6f} | MAD: {resumen['mad']:.6f}\n")
+        if aritmetica(idioma):
+            f.write(f"Aritmética: {aritmetica(idioma)}\n")
+        if verificacion:
+            f.write(f"Verificación de la salida: {verificacion}\n")
+        if recursos:
+            f.write(f"CPU usuario: {recursos['cpu_usuario']:.6f} s | CPU sistema: {recursos['cpu_sistema']:.6f} s | "
+                    f"RSS máx: {formatear_rss(recursos['rss_max_kb'])} | cambios de contexto vol/invol: "
+                    f"{recursos['cambios_voluntarios']:.0f}/{recursos['cambios_involuntarios']:.0f} | "
+                    f"fallos de página men/may: {recursos['fallos_menores']:.0f}/{recursos['fallos_mayores']:.0f}\n")
+        if calibracion and "arnes" in calibracion:
+            arnes = calibracion["arnes"]["mediana"]
+            f.write(f"Sobrecarga del arnés: {arnes:.6f} segundos\n")
+            if idioma in calibracion and modo == "proceso":
+                arranque = calibracion[idioma]["mediana"]
+                f.write(f"Arranque del runtime (programa vacío): {arranque:.6f} segundos | "
+                        f"carga de trabajo neta: {tiempo - arranque:.6f} segundos\n")
+        f.write("\nSalida del programa:\n")
         f.write(output)
         if error:
             f.write("\n\nErrores:\n")
             f.write(error)
 
+def ejecutar_variantes(args, idiomas, variantes):
+    intervalo_muestreo = args.muestreo_ms / 1000 if args.muestreo_ms else None
+    resultados = {}
+    for n in args.tamanos:
+        if CARGA == "archivos":
+            archivos.preparar_datos(DIR_DATOS, n)
+        for tipo, cache in variantes:
+            if CARGA == "archivos":
+                disponibles = [idioma for idioma in idiomas if tipo in estrategias_por_idioma[idioma]]
+            else:
+                disponibles = idiomas
+            if args.modo in ("worker", "ambos"):
+                for idioma in disponibles:
+                    print(f"Ejecutando {idioma} en modo worker con {describir(n, tipo, cache)} "
+                          f"({args.calentamiento} calentamiento, {args.repeticiones} repeticiones)...")
+                    resultados[(idioma, n, "worker", tipo, cache)] = ejecutar_worker(
+                        idioma, args.calentamiento, args.repeticiones, n, tipo)
+            if args.modo == "worker":
+                continue
+            if args.intercalado:
+                print(f"Ejecutando {', '.join(disponibles)} intercalados con {describir(n, tipo, cache)} "
+                      f"({args.calentamiento} calentamiento, {args.repeticiones} repeticiones)...")
+                intercalados = ejecutar_intercalado(
+                    disponibles, args.calentamiento, args.repeticiones, intervalo_muestreo, n, tipo, cache)
+                for idioma, resultado in intercalados.items():
+                    resultados[(idioma, n, "proceso", tipo, cache)] = resultado
+            else:
+                for idioma in disponibles:
+                    print(f"Ejecutando {idioma} con {describir(n, tipo, cache)} "
+                          f"({args.calentamiento} calentamiento, {args.repeticiones} repeticiones)...")
+                    resultados[(idioma, n, "proceso", tipo, cache)] = ejecutar_repeticiones(
+                        idioma, comando_para(idioma, n, tipo), args.calentamiento, args.repeticiones,
+                        intervalo_muestreo, n, tipo, cache)
+    return resultados
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Mide el tiempo de ejecución de cada carga de trabajo en cada lenguaje")
+    parser.add_argument("--carga", choices=["fibonacci", "archivos"], default="fibonacci",
+                        help="fibonacci: Sucesionfibonacci; archivos: lectura y procesamiento de un archivo de "
+                             "texto generado de n MB (--tamanos en MB)")
+    parser.add_argument("--entorno", default="vm",
+                        help="etiqueta del entorno; los resultados se guardan en ../results-<entorno>")
+    parser.add_argument("--calentamiento", type=int, default=0,
+                        help="ejecuciones previas que no se incluyen en el resumen")
+    parser.add_argument("--repeticiones", type=int, default=1,
+                        help="ejecuciones medidas por lenguaje")
+    parser.add_argument("--tamanos", type=lambda texto: [int(n) for n in texto.split(",")],
+                        default=[N_POR_DEFECTO],
+                        help=f"tamaños de entrada separados por comas (por defecto {N_POR_DEFECTO})")
+    parser.add_argument("--barrido", action="store_true",
+                        help=f"barre n por órdenes de magnitud: {', '.join(map(str, BARRIDO))} con --tipo "
+                             f"termino o rango, hasta {MAXIMO_SERIE} con la serie completa, cuya salida crece "
+                             f"como n² (con --carga archivos, {', '.join(map(str, BARRIDO_ARCHIVOS))} MB)")
+    parser.add_argument("--tipo", choices=["serie", "termino", "rango"], default="serie",
+                        help=f"serie: n términos; termino: solo F(n); rango: F(n) .. F(n+{ANCHO_RANGO - 1}) "
+                             "(termino y rango solo en Python)")
+    parser.add_argument("--bigint", action="store_true",
+                        help="aritmética exacta en los tres lenguajes (BigInteger en Java, BigInt en Node); "
+                             "sin ella Java usa long (int64) y Node Number (float64)")
+    parser.add_argument("--estrategias", type=lambda texto: texto.split(","), default=ESTRATEGIAS,
+                        help="estrategias de lectura de la carga archivos separadas por comas: lineas, bloques, "
+                             "mmap (mmap no existe en Node)")
+    parser.add_argument("--cache", choices=["frio", "caliente", "ambos"], default="ambos",
+                        help="estado del archivo de datos en la caché de páginas antes de cada ejecución")
+    parser.add_argument("--dir-datos", default=DIR_DATOS,
+                        help="directorio de los archivos generados; debe estar en el almacenamiento a comparar")
+    parser.add_argument("--modo", choices=["proceso", "worker", "ambos"], default="proceso",
+                        help="proceso: un lanzamiento por medición (arranque en frío); worker: un proceso "
+                             "persistente que mide el cálculo en caliente; ambos: las dos cosas")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="tiempo máximo por ejecución en segundos; se aborta el hijo al superarlo")
+    parser.add_argument("--parquet", action="store_true",
+                        help=f"además de {ALMACEN}, exporta el almacén a Parquet (requiere pandas y pyarrow)")
+    parser.add_argument("--legado", action="store_true",
+                        help="escribe también los resultado_*.txt y muestras_*.csv del formato anterior")
+    parser.add_argument("--guardar-salida", action="store_true",
+                        help="guarda la salida completa de cada ejecución en <resultados>/salidas/ "
+                             "(por defecto solo el principio y el digest de los enteros)")
+    parser.add_argument("--muestreo-ms", type=float, default=None,
+                        help="activa el muestreo de /proc del hijo cada N milisegundos y guarda la línea temporal")
+    parser.add_argument("--calibrar", action="store_true",
+                        help="mide /bin/true y un script vacío por runtime para reportar la sobrecarga por separado")
+    parser.add_argument("--aislado", action="store_true",
+                        help="modo de control de ruido: afinidad, prioridad y comprobación del estado de la máquina")
+    parser.add_argument("--cpus-arnes", default=None,
+                        help="CPUs para el arnés en modo aislado (p. ej. 0 o 0-1)")
+    parser.add_argument("--cpus-hijo", default=None,
+                        help="CPUs para los programas medidos en modo aislado (p. ej. 2,3)")
+    parser.add_argument("--prioridad", type=int, default=None,
+                        help="valor nice para el arnés y sus hijos (negativo requiere privilegios)")
+    parser.add_argument("--carga-maxima", type=float, default=0.3,
+                        help="carga promedio por CPU a partir de la cual la máquina se considera ruidosa")
+    parser.add_argument("--estricto", action="store_true",
+                        help="en modo aislado, abortar en lugar de advertir si la máquina es ruidosa")
+    parser.add_argument("--backend", choices=list(entornos.BACKENDS), default="host",
+                        help="entorno en el que se lanzan los programas; se cronometra su creación, "
+                             "disponibilidad y destrucción")
+    parser.add_argument("--backend-opcion", action="append", default=[], metavar="CLAVE=VALOR",
+                        help="opción del backend (p. ej. imagen=proyecto-tic para docker o maquina=ubuntu "
+                             "para vm); se puede repetir")
+    parser.add_argument("--ciclos-entorno", type=int, default=0,
+                        help="ciclos de creación y destrucción del entorno sin carga, medidos antes de la carga")
+    parser.add_argument("--perfil", action="store_true",
+                        help="tras las mediciones, ejecutar cada programa una vez bajo su perfilador nativo "
+                             "y guardar las pilas colapsadas en perfiles/<run_id>/")
+    parser.add_argument("--intercalado", action="store_true",
+                        help="alternar los lenguajes en cada repetición (orden ABBA)")
+    args = parser.parse_args()
+    if args.repeticiones < 1 or args.calentamiento < 0:
+        parser.error("--repeticiones debe ser >= 1 y --calentamiento >= 0")
+    if args.carga == "archivos":
+        if args.modo != "proceso" or args.bigint or args.tipo != "serie":
+            parser.error("--carga archivos solo admite --modo proceso, sin --bigint ni --tipo")
+        if set(args.estrategias) - set(ESTRATEGIAS):
+            parser.error(f"--estrategias admite {', '.join(ESTRATEGIAS)}")
+        if min(args.tamanos) < 1:
+            parser.error("con --carga archivos, --tamanos son MB y deben ser >= 1")
+    backend = entornos.BACKENDS[args.backend]
+    if args.ciclos_entorno < 0:
+        parser.error("--ciclos-entorno debe ser >= 0")
+    if any("=" not in opcion for opcion in args.backend_opcion):
+        parser.error("--backend-opcion espera CLAVE=VALOR")
+    if args.perfil and not backend.comparte_archivos:
+        parser.error(f"--perfil requiere un backend que comparta archivos con el runner, no {args.backend}")
+    if args.muestreo_ms and backend.envuelve:
+        print(f"ADVERTENCIA: con --backend {args.backend} el programa corre tras un envoltorio; "
+              f"el muestreo de /proc no está disponible y --muestreo-ms se ignora")
+    if not backend.mide_recursos:
+        print(f"ADVERTENCIA: con --backend {args.backend} wait4 solo ve al cliente que lanza el programa; "
+              f"las columnas de CPU, memoria, cambios de contexto y fallos de página quedan vacías")
+    if args.carga == "archivos" and not backend.comparte_cache:
+        parser.error(f"--carga archivos controla la caché desde el anfitrión y no admite --backend {args.backend}")
+    args.caches = ESTADOS_CACHE if args.cache == "ambos" else [args.cache]
+    if args.barrido:
+        if args.carga == "archivos":
+            args.tamanos = BARRIDO_ARCHIVOS
+        else:
+            args.tamanos = BARRIDO_SERIE if args.tipo == "serie" else BARRIDO
+    if args.carga == "fibonacci" and args.tipo == "serie" and max(args.tamanos) > MAXIMO_SERIE:
+        print(f"ADVERTENCIA: la serie completa con n > {MAXIMO_SERIE} imprime del orden de 0,1·n² dígitos y su "
+              f"referencia tarda de minutos a días; use --tipo termino o rango para n grandes")
+    return args
+
 def main():
-    java_compilado = compilar_java()
+    global RESULTS_DIR, TIMEOUT, TIPO, BIGINT, GUARDAR_SALIDA, CARGA, DIR_DATOS, ENTORNO
+    args = parse_args()
+    RESULTS_DIR = f"../results-{args.entorno}"
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    TIMEOUT = args.timeout
+    TIPO = args.tipo
+    BIGINT = args.bigint
+    GUARDAR_SALIDA = args.guardar_salida
+    CARGA = args.carga
+    DIR_DATOS = args.dir_datos
+    run_id = nuevo_run_id()
+    metadatos = None
+    if args.aislado:
+        metadatos = preparar_aislamiento(args, run_id)
+        if metadatos is None:
+            return
+    fuentes = sources if CARGA == "fibonacci" else archivos_sources
+    java_compilado = compilar_java(fuentes["java"])
 
+    idiomas = []
     for idioma in commands:
         # Verificamos si el archivo fuente existe
-        if idioma in sources and not os.path.exists(sources[idioma]):
+        if idioma in fuentes and not os.path.exists(fuentes[idioma]):
             print(f"Archivo fuente de {idioma} no encontrado, saltando...")
             continue
 
@@ -66,10 +874,103 @@ def main():
             print("Saltando ejecución de Java debido a errores de compilación")
             continue
 
-        print(f"Ejecutando {idioma}...")
-        tiempo, output, error = medir_tiempo(commands[idioma])
-        guardar_resultados(idioma, tiempo, output, error)
-        print(f"Terminado {idioma}: {tiempo:.6f} segundos")
+        if CARGA == "fibonacci" and TIPO not in tipos_por_idioma[idioma]:
+            print(f"{idioma} no implementa peticiones de tipo '{TIPO}', saltando...")
+            continue
+        idiomas.append(idioma)
+
+    # Cada variante es un tipo de petición (Fibonacci) o una estrategia de
+    # lectura con un estado de la caché (archivos)
+    if CARGA == "fibonacci":
+        variantes = [(TIPO, None)]
+    else:
+        variantes = [(estrategia, cache) for estrategia in args.estrategias for cache in args.caches]
+
+    try:
+        ENTORNO, ciclos = preparar_entorno(args)
+    except entornos.ErrorEntorno as e:
+        print(f"No se pudo levantar el entorno {args.backend}: {e}")
+        return
+    print(f"Entorno {args.backend} listo: creación {ciclos[-1]['creacion']:.3f} s, "
+          f"listo {ciclos[-1]['listo']:.3f} s")
+    try:
+        # La calibración se mide dentro del mismo entorno que la carga
+        calibracion = None
+        if args.calibrar:
+            vacio_compilado = java_compilado and compilar_java(null_sources["java"])
+            calibracion = calibrar(max(args.repeticiones, 5), vacio_compilado)
+        resultados = ejecutar_variantes(args, idiomas, variantes)
+        # Los perfiles van al final para que el perfilador no altere ninguna medición
+        perfiles = []
+        if args.perfil:
+            for idioma, n, modo, tipo, cache in list(resultados):
+                if modo == "proceso":
+                    perfiles.append(perfilar(idioma, n, run_id, tipo, cache))
+        # Versiones del runtime que se midió, consultadas fuera de cualquier medición
+        versiones = {idioma: historial.version_runtime(idioma, ENTORNO.envolver) for idioma in idiomas}
+    finally:
+        ciclos[-1].update(entornos.desmontar(ENTORNO))
+        ENTORNO = entornos.Anfitrion()
+        ruta = guardar_ciclos_entorno(ciclos, run_id, args.entorno, args.backend)
+        arranques = [ciclo["creacion"] + ciclo["listo"] for ciclo in ciclos]
+        if ciclos[-1]["error"]:
+            print(f"ADVERTENCIA: no se pudo destruir el entorno {args.backend} ({ciclos[-1]['error']}); "
+                  f"puede seguir en marcha")
+        else:
+            print(f"Entorno {args.backend} destruido en {ciclos[-1]['destruccion']:.3f} s", end="; ")
+        print(f"creación hasta listo: mediana {statistics.median(arranques):.3f} s en {len(arranques)} ciclos "
+              f"({ruta})")
+
+    muestras = {}
+    # Las etiquetas de cada resultado dependen de la variante con la que se midió
+    for (idioma, n, modo, tipo, cache), (registros, output, error) in resultados.items():
+        muestras.setdefault(idioma, []).extend(registros)
+        medidos = [r for r in registros if r["fase"] == "medicion"]
+        if not medidos:
+            print(f"Sin mediciones para {idioma} ({describir(n, tipo, cache)}, {modo}): {error}")
+            continue
+        # Las ejecuciones que fallaron o agotaron el tiempo no tienen un tiempo de ejecución válido
+        fallidos = [r for r in medidos if r.get("error")]
+        if fallidos:
+            agotados = sum("timed out" in r["error"] for r in fallidos)
+            print(f"ADVERTENCIA: {len(fallidos)} de {len(medidos)} repeticiones de {idioma} "
+                  f"({contexto(n, modo, idioma, tipo, cache)}) fallaron ({agotados} por tiempo agotado): {fallidos[-1]['error']}")
+        medidos = [r for r in medidos if not r.get("error")]
+        if not medidos:
+            print(f"Sin mediciones válidas para {idioma} ({describir(n, tipo, cache)}, {modo})")
+            continue
+        # Las ejecuciones con salida incorrecta no entran en el resumen salvo que no haya otras
+        validos = [r for r in medidos if r.get("correcto") != "no"]
+        verificacion = estado_verificacion(medidos)
+        if len(validos) < len(medidos):
+            print(f"ADVERTENCIA: salida incorrecta de {idioma} ({contexto(n, modo, idioma, tipo, cache)}): {verificacion}")
+        resumen = resumir([r["tiempo"] for r in validos or medidos])
+        recursos = resumir_recursos(medidos)
+        if args.legado:
+            guardar_resultados(idioma, resumen["mediana"], output, error, resumen, calibracion, recursos, n, modo,
+                               verificacion, tipo, cache)
+        print(f"Terminado {idioma} ({contexto(n, modo, idioma, tipo, cache)}): mediana {resumen['mediana']:.6f} s, "
+              f"p95 {resumen['p95']:.6f} s, MAD {resumen['mad']:.6f} s")
+        if recursos:
+            print(f"  CPU {recursos['cpu_usuario'] + recursos['cpu_sistema']:.6f} s, "
+                  f"RSS máx {formatear_rss(recursos['rss_max_kb'])}")
+
+    ejecuciones = [registro for registros in muestras.values() for registro in registros] + perfiles
+    if ejecuciones:
+        metadatos = metadatos or aislamiento.leer_metadatos_sistema()
+        ruta = guardar_almacen(ejecuciones, run_id, args.entorno, metadatos)
+        print(f"{len(ejecuciones)} ejecuciones añadidas a {ruta} (run {run_id})")
+        base = historial.registrar(os.path.join(RESULTS_DIR, historial.BASE_DATOS), run_id, args.entorno,
+                                   ejecuciones, metadatos, versiones, historial.revision_git())
+        print(f"Run {run_id} registrado en {base}; compárelo con: python3 historial.py --entorno {args.entorno} comparar")
+        if args.parquet:
+            destino = exportar_parquet(ruta)
+            if destino:
+                print(f"Almacén exportado a {destino}")
+    if args.legado:
+        for idioma, registros in muestras.items():
+            # Cada tipo de petición y aritmética guarda sus muestras aparte para no pisar las de la serie
+            guardar_muestras(etiqueta(idioma, None) if CARGA == "fibonacci" else f"{idioma}_archivos", registros)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()